@@ -0,0 +1,61 @@
+"""add calendar event cache
+
+Revision ID: 0d49615c0b28
+Revises: 89d043d45015
+Create Date: 2026-10-18 09:12:41.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0d49615c0b28'
+down_revision: Union[str, Sequence[str], None] = '89d043d45015'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('calendar_sync_state',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('source_id', sa.Integer(), nullable=False),
+    sa.Column('calendar_url', sa.String(length=500), nullable=False),
+    sa.Column('ctag', sa.String(length=200), nullable=True),
+    sa.Column('sync_token', sa.String(length=500), nullable=True),
+    sa.Column('synced_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['source_id'], ['calendar_sources.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('source_id', 'calendar_url', name='uq_calendar_sync_state_source_calendar')
+    )
+    op.create_table('calendar_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('source_id', sa.Integer(), nullable=False),
+    sa.Column('calendar_url', sa.String(length=500), nullable=False),
+    sa.Column('href', sa.String(length=500), nullable=False),
+    sa.Column('etag', sa.String(length=200), nullable=True),
+    sa.Column('uid', sa.String(length=300), nullable=False),
+    sa.Column('summary', sa.String(length=500), nullable=False),
+    sa.Column('starts_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('ends_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('all_day', sa.Boolean(), nullable=False),
+    sa.Column('location', sa.Text(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('rrule', sa.Text(), nullable=True),
+    sa.Column('ical', sa.Text(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['source_id'], ['calendar_sources.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('source_id', 'href', name='uq_calendar_events_source_href')
+    )
+    op.create_index('ix_calendar_events_source_starts_at', 'calendar_events', ['source_id', 'starts_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_calendar_events_source_starts_at', table_name='calendar_events')
+    op.drop_table('calendar_events')
+    op.drop_table('calendar_sync_state')
@@ -0,0 +1,36 @@
+"""add meal ingredient cache
+
+Revision ID: 3e8b6d1f5a20
+Revises: 9c3f4a7d2e18
+Create Date: 2026-10-18 17:02:14.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '3e8b6d1f5a20'
+down_revision: Union[str, Sequence[str], None] = '9c3f4a7d2e18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('meal_ingredient_cache',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('meal_key', sa.String(length=300), nullable=False),
+    sa.Column('model', sa.String(length=100), nullable=False),
+    sa.Column('ingredients', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('meal_key', 'model', name='uq_meal_ingredient_cache_meal_model')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('meal_ingredient_cache')
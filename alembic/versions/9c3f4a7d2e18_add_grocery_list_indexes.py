@@ -0,0 +1,30 @@
+"""add grocery list indexes
+
+Revision ID: 9c3f4a7d2e18
+Revises: 5b7e21c9a4d3
+Create Date: 2026-10-18 16:05:37.220416
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3f4a7d2e18'
+down_revision: Union[str, Sequence[str], None] = '5b7e21c9a4d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_grocery_lists_created_at_id', 'grocery_lists', ['created_at', 'id'], unique=False)
+    op.create_index('ix_grocery_items_list_id', 'grocery_items', ['list_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_grocery_items_list_id', table_name='grocery_items')
+    op.drop_index('ix_grocery_lists_created_at_id', table_name='grocery_lists')
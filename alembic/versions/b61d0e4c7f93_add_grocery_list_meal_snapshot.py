@@ -0,0 +1,28 @@
+"""add grocery list meal snapshot
+
+Revision ID: b61d0e4c7f93
+Revises: 3e8b6d1f5a20
+Create Date: 2026-10-18 18:21:47.906531
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'b61d0e4c7f93'
+down_revision: Union[str, Sequence[str], None] = '3e8b6d1f5a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('grocery_lists', sa.Column('meal_snapshot', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('grocery_lists', 'meal_snapshot')
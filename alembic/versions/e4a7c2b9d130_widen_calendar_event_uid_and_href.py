@@ -0,0 +1,42 @@
+"""widen calendar event uid and href
+
+Revision ID: e4a7c2b9d130
+Revises: b61d0e4c7f93
+Create Date: 2026-10-18 21:04:12.337842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a7c2b9d130'
+down_revision: Union[str, Sequence[str], None] = 'b61d0e4c7f93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column('calendar_events', 'href',
+               existing_type=sa.String(length=500),
+               type_=sa.Text(),
+               existing_nullable=False)
+    op.alter_column('calendar_events', 'uid',
+               existing_type=sa.String(length=300),
+               type_=sa.Text(),
+               existing_nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('calendar_events', 'uid',
+               existing_type=sa.Text(),
+               type_=sa.String(length=300),
+               existing_nullable=False)
+    op.alter_column('calendar_events', 'href',
+               existing_type=sa.Text(),
+               type_=sa.String(length=500),
+               existing_nullable=False)
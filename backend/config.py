@@ -16,10 +16,20 @@ class Settings(BaseSettings):
 
     # Ollama
     ollama_base_url: str = "http://localhost:11434"
+    ollama_grocery_model: str = "llama3.3:70b"
+    ollama_max_concurrency: int = 3  # parallel per-meal ingredient requests
 
     # Weather
     weather_lat: float = 40.5853
     weather_lon: float = -105.0844
+    weather_api_url: str = "https://api.open-meteo.com/v1/forecast"  # point at a local stand-in for testing
+    weather_refresh_minutes: int = 10
+
+    # Grocery
+    household_servings: int = 4  # saved recipes are scaled from their own servings to this
+
+    # Calendar
+    calendar_sync_minutes: int = 5
 
     # Server
     port: int = 8400
@@ -46,6 +46,12 @@ async def get_current_user(request: Request, db: AsyncSession = Depends(get_db))
     raise HTTPException(status_code=401, detail="Not authenticated")
 
 
+async def get_stream_user(request: Request) -> User:
+    """Authenticate a long-lived (streaming) request without pinning a DB connection for its lifetime."""
+    async with async_session() as db:
+        return await get_current_user(request, db)
+
+
 async def create_session(db: AsyncSession, user_id: int) -> str:
     """Create a new session and return the session ID."""
     session_id = secrets.token_urlsafe(64)
@@ -0,0 +1,82 @@
+"""
+App-lifetime pooled HTTP clients for outbound APIs.
+
+One httpx.AsyncClient per upstream, opened in the FastAPI lifespan and closed
+on shutdown, so keep-alive connections (HTTP/2 where the upstream speaks TLS)
+are reused across requests instead of paying DNS + TCP + TLS per call.
+Clients are created lazily too, so scripts that never run the lifespan work.
+"""
+
+import logging
+from dataclasses import dataclass
+
+import httpx
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ClientSpec:
+    timeout: float
+    max_connections: int
+    max_keepalive: int
+    http2: bool = True
+    keepalive_expiry: float = 300.0
+
+
+CLIENTS: dict[str, ClientSpec] = {
+    # Chat tool loops and meal generation; long timeouts for model inference.
+    "anthropic": ClientSpec(timeout=120.0, max_connections=20, max_keepalive=10),
+    # Local plain-HTTP server: no TLS to amortize and no h2c, just keep-alive.
+    "ollama": ClientSpec(timeout=60.0, max_connections=8, max_keepalive=4, http2=False),
+    "weather": ClientSpec(timeout=8.0, max_connections=4, max_keepalive=2),
+}
+
+ANTHROPIC_MESSAGES_URL = "https://api.anthropic.com/v1/messages"
+
+
+def anthropic_headers() -> dict:
+    return {
+        "x-api-key": settings.anthropic_api_key,
+        "anthropic-version": "2023-06-01",
+        "content-type": "application/json",
+    }
+
+
+class HttpClientRegistry:
+    def __init__(self, specs: dict[str, ClientSpec]):
+        self.specs = specs
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            spec = self.specs[name]
+            client = httpx.AsyncClient(
+                http2=spec.http2,
+                timeout=spec.timeout,
+                limits=httpx.Limits(
+                    max_connections=spec.max_connections,
+                    max_keepalive_connections=spec.max_keepalive,
+                    keepalive_expiry=spec.keepalive_expiry,
+                ),
+            )
+            self._clients[name] = client
+        return client
+
+    def start(self):
+        for name in self.specs:
+            self.get(name)
+
+    async def aclose(self):
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.debug(f"Error closing HTTP client: {e}")
+
+
+http_clients = HttpClientRegistry(CLIENTS)
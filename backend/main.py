@@ -1,5 +1,6 @@
+import asyncio
 import os
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
 
 from fastapi import FastAPI
@@ -12,8 +13,19 @@ from backend.config import settings
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    from backend.services.weather_service import run_forecast_prefetcher
+    from backend.services.calendar_sync import run_calendar_sync
+    from backend.http_clients import http_clients
+    http_clients.start()
+    weather_task = asyncio.create_task(run_forecast_prefetcher(settings.weather_refresh_minutes * 60))
+    calendar_task = asyncio.create_task(run_calendar_sync(settings.calendar_sync_minutes * 60))
     yield
     # Shutdown
+    for task in (weather_task, calendar_task):
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await http_clients.aclose()
     from backend.database import engine
     await engine.dispose()
 
@@ -37,7 +49,7 @@ app.add_middleware(
 )
 
 # Register routers
-from backend.routers import auth, health, chores, dashboard, recipes, meals, grocery, outdoor, calendar, pantry, home, chat
+from backend.routers import auth, health, chores, dashboard, recipes, meals, grocery, outdoor, calendar, pantry, home, chat, events, weather
 
 app.include_router(auth.router)
 app.include_router(health.router)
@@ -51,6 +63,8 @@ app.include_router(calendar.router)
 app.include_router(pantry.router)
 app.include_router(home.router)
 app.include_router(chat.router)
+app.include_router(events.router)
+app.include_router(weather.router)
 
 # Serve frontend build in production
 frontend_dist = Path(__file__).parent.parent / "frontend" / "dist"
@@ -1,19 +1,21 @@
 from backend.models.user import User, SessionAuth
 from backend.models.chore import Chore, ChoreCompletion
 from backend.models.meal import MealPlan, Recipe
-from backend.models.grocery import GroceryList, GroceryItem
+from backend.models.grocery import GroceryList, GroceryItem, MealIngredientCache
 from backend.models.pantry import PantryItem
-from backend.models.calendar import CalendarSource
+from backend.models.calendar import CalendarSource, CalendarSyncState, CachedCalendarEvent
 from backend.models.outdoor import OutdoorSession, SavedOption
 from backend.models.home import Appliance, MaintenanceTask, MaintenanceLog
+from backend.models.chat import ChatConversation, ChatMessage
 
 __all__ = [
     "User", "SessionAuth",
     "Chore", "ChoreCompletion",
     "MealPlan", "Recipe",
-    "GroceryList", "GroceryItem",
+    "GroceryList", "GroceryItem", "MealIngredientCache",
     "PantryItem",
-    "CalendarSource",
+    "CalendarSource", "CalendarSyncState", "CachedCalendarEvent",
     "OutdoorSession", "SavedOption",
     "Appliance", "MaintenanceTask", "MaintenanceLog",
+    "ChatConversation", "ChatMessage",
 ]
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import String, DateTime, Integer, Boolean, ForeignKey, func
+from sqlalchemy import String, Text, DateTime, Integer, Boolean, ForeignKey, UniqueConstraint, Index, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.database import Base
@@ -19,3 +19,45 @@ class CalendarSource(Base):
     color: Mapped[str] = mapped_column(String(7), default="#6366f1")
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+class CalendarSyncState(Base):
+    """Per-calendar sync cursor (RFC 6578 sync-token, falling back to CalendarServer ctag)."""
+    __tablename__ = "calendar_sync_state"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    source_id: Mapped[int] = mapped_column(Integer, ForeignKey("calendar_sources.id", ondelete="CASCADE"), nullable=False)
+    calendar_url: Mapped[str] = mapped_column(String(500), nullable=False)
+    ctag: Mapped[str | None] = mapped_column(String(200))
+    sync_token: Mapped[str | None] = mapped_column(String(500))
+    synced_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("source_id", "calendar_url", name="uq_calendar_sync_state_source_calendar"),
+    )
+
+
+class CachedCalendarEvent(Base):
+    """One CalDAV resource (an event, or a recurring series with its overrides) mirrored locally."""
+    __tablename__ = "calendar_events"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    source_id: Mapped[int] = mapped_column(Integer, ForeignKey("calendar_sources.id", ondelete="CASCADE"), nullable=False)
+    calendar_url: Mapped[str] = mapped_column(String(500), nullable=False)
+    href: Mapped[str] = mapped_column(Text, nullable=False)
+    etag: Mapped[str | None] = mapped_column(String(200))
+    uid: Mapped[str] = mapped_column(Text, nullable=False)
+    summary: Mapped[str] = mapped_column(String(500), nullable=False)
+    starts_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    ends_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    all_day: Mapped[bool] = mapped_column(Boolean, default=False)
+    location: Mapped[str | None] = mapped_column(Text)
+    description: Mapped[str | None] = mapped_column(Text)
+    rrule: Mapped[str | None] = mapped_column(Text)  # set for recurring series; occurrences are expanded locally
+    ical: Mapped[str] = mapped_column(Text, nullable=False)  # raw resource, kept for recurrence expansion
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("source_id", "href", name="uq_calendar_events_source_href"),
+        Index("ix_calendar_events_source_starts_at", "source_id", "starts_at"),
+    )
@@ -1,23 +1,42 @@
 from datetime import date, datetime
 
-from sqlalchemy import String, Text, Date, DateTime, Integer, Boolean, ForeignKey, func
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Text, Date, DateTime, Integer, Boolean, ForeignKey, Index, UniqueConstraint, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from backend.database import Base
 
 
 class GroceryList(Base):
     __tablename__ = "grocery_lists"
+    __table_args__ = (
+        Index("ix_grocery_lists_created_at_id", "created_at", "id"),  # keyset pagination
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     week_of: Mapped[date] = mapped_column(Date, nullable=False)
     name: Mapped[str | None] = mapped_column(String(255))
     status: Mapped[str] = mapped_column(String(20), default="active")  # active, shopping, completed
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # What the list was generated from, for incremental regeneration; None for hand-made lists:
+    # {"meals": [{meal_id, date, name, recipe_id, source, ingredients}], "items": {key: {quantity, notes}}}
+    meal_snapshot: Mapped[dict | None] = mapped_column(JSONB)
+
+    # Never lazy-loaded (that would be a hidden query per list under asyncio);
+    # load with selectinload() or refresh(..., ["items"]).
+    items: Mapped[list["GroceryItem"]] = relationship(
+        back_populates="grocery_list",
+        order_by="(GroceryItem.category, GroceryItem.item_name)",
+        passive_deletes=True,
+        lazy="raise",
+    )
 
 
 class GroceryItem(Base):
     __tablename__ = "grocery_items"
+    __table_args__ = (
+        Index("ix_grocery_items_list_id", "list_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     list_id: Mapped[int] = mapped_column(Integer, ForeignKey("grocery_lists.id", ondelete="CASCADE"), nullable=False)
@@ -32,3 +51,20 @@ class GroceryItem(Base):
     wholefoods_url: Mapped[str | None] = mapped_column(String(500))
     notes: Mapped[str | None] = mapped_column(Text)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    grocery_list: Mapped[GroceryList] = relationship(back_populates="items", lazy="raise")
+
+
+class MealIngredientCache(Base):
+    """Ingredients an Ollama model suggested for a meal, so the same meal isn't asked about twice."""
+
+    __tablename__ = "meal_ingredient_cache"
+    __table_args__ = (
+        UniqueConstraint("meal_key", "model", name="uq_meal_ingredient_cache_meal_model"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    meal_key: Mapped[str] = mapped_column(String(300), nullable=False)  # normalize_item_name(meal_name)
+    model: Mapped[str] = mapped_column(String(100), nullable=False)
+    ingredients: Mapped[list] = mapped_column(JSONB, nullable=False)  # [{name, quantity, category}]
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -1,19 +1,33 @@
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.config import settings
-from backend.deps import get_db, get_current_user
+from backend.database import async_session
+from backend.deps import get_db, get_current_user, get_stream_user
 from backend.models.user import User
-from backend.schemas.chat import ChatRequest, ChatResponse
+from backend.schemas.chat import (
+    ChatRequest, ChatResponse, ConversationResponse, ConversationDetailResponse, ConversationMessageResponse,
+)
 from backend.services.chat_service import ChatService
+from backend.services.conversation_service import ConversationService
+from backend.services.event_hub import format_sse
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/chat", tags=["chat"])
 
 
+def _require_api_key():
+    if not settings.anthropic_api_key or settings.anthropic_api_key.startswith("your-"):
+        raise HTTPException(
+            status_code=503,
+            detail="Anthropic API key not configured. Set ANTHROPIC_API_KEY in .env",
+        )
+
+
 @router.post("", response_model=ChatResponse)
 async def chat(
     data: ChatRequest,
@@ -21,19 +35,80 @@ async def chat(
     user: User = Depends(get_current_user),
 ):
     """Process a chat message using AI with tool-use to drive Home Hub actions."""
-    if not settings.anthropic_api_key or settings.anthropic_api_key.startswith("your-"):
-        raise HTTPException(
-            status_code=503,
-            detail="Anthropic API key not configured. Set ANTHROPIC_API_KEY in .env",
-        )
+    _require_api_key()
 
     try:
         service = ChatService(db, user)
-        result = await service.chat(data.message)
+        result = await service.chat(data.message, data.conversation_id)
         return ChatResponse(
             response=result["response"],
             actions_taken=result["actions_taken"],
+            usage=result["usage"],
+            conversation_id=result["conversation_id"],
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Chat error: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Chat service error: {str(e)}")
+
+
+@router.post("/stream")
+async def chat_stream(
+    data: ChatRequest,
+    user: User = Depends(get_stream_user),
+):
+    """Streamed chat: server-sent text, tool_start, tool_done and a final done (or error) event."""
+    _require_api_key()
+    if data.conversation_id is not None:
+        async with async_session() as db:
+            await ConversationService(db).get(data.conversation_id, user)
+
+    async def stream():
+        # The session lives as long as the stream, not the request's dependency scope.
+        async with async_session() as db:
+            try:
+                async for event in ChatService(db, user).chat_stream(data.message, data.conversation_id):
+                    yield format_sse(event, event=event["type"])
+            except Exception as e:
+                logger.error(f"Chat stream error: {e}", exc_info=True)
+                yield format_sse({"type": "error", "detail": f"Chat service error: {str(e)}"}, event="error")
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/conversations", response_model=list[ConversationResponse])
+async def list_conversations(
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    return await ConversationService(db).list_all(user, limit=limit)
+
+
+@router.get("/conversations/{conversation_id}", response_model=ConversationDetailResponse)
+async def get_conversation(
+    conversation_id: int,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    service = ConversationService(db)
+    conversation = await service.get(conversation_id, user)
+    messages = await service.messages(conversation)
+    return ConversationDetailResponse(
+        **ConversationResponse.model_validate(conversation).model_dump(),
+        messages=[ConversationMessageResponse.model_validate(m) for m in messages],
+    )
+
+
+@router.delete("/conversations/{conversation_id}")
+async def delete_conversation(
+    conversation_id: int,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    return await ConversationService(db).delete(conversation_id, user)
@@ -0,0 +1,41 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+
+from backend.deps import get_stream_user
+from backend.models.user import User
+from backend.services.event_hub import event_hub, format_sse
+
+router = APIRouter(prefix="/api/events", tags=["events"])
+
+HEARTBEAT_SECONDS = 15
+
+
+@router.get("")
+async def stream_events(
+    request: Request,
+    topics: str = Query("dashboard", description="Comma-separated: dashboard, chores, meals, grocery, grocery:{list_id}"),
+    user: User = Depends(get_stream_user),
+):
+    """Server-sent event stream of deltas produced by the service layer."""
+    sub = event_hub.subscribe({t.strip() for t in topics.split(",") if t.strip()})
+
+    async def stream():
+        try:
+            yield "retry: 5000\n\n"
+            yield format_sse({"topic": "hub", "type": "connected", "data": {"topics": sorted(sub.topics)}})
+            while not await request.is_disconnected():
+                try:
+                    frame = await asyncio.wait_for(sub.queue.get(), timeout=HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    frame = ": keep-alive\n\n"
+                yield frame
+        finally:
+            event_hub.unsubscribe(sub)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,13 +1,13 @@
 from datetime import date
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.deps import get_db, get_current_user
 from backend.models.user import User
 from backend.schemas.grocery import (
     GroceryListCreate, GroceryListResponse,
-    GroceryItemCreate, GroceryItemUpdate, GroceryItemResponse,
+    GroceryItemCreate, GroceryItemUpdate, GroceryItemResponse, GroceryBulkAdd,
     GenerateFromMealsRequest,
 )
 from backend.services.grocery_service import GroceryService
@@ -17,20 +17,21 @@ router = APIRouter(prefix="/api/grocery", tags=["grocery"])
 
 @router.get("", response_model=list[GroceryListResponse])
 async def list_grocery_lists(
+    response: Response,
     status: str | None = Query(None),
+    limit: int | None = Query(None, ge=1, le=100, description="Page size; omit for every list"),
+    before: int | None = Query(None, description="Id of the last list on the previous page (see X-Next-Cursor)"),
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    lists = await GroceryService(db).list_all(status=status)
-    # Attach items to each list
-    svc = GroceryService(db)
-    result = []
-    for gl in lists:
-        items = await svc.get_items(gl.id)
-        response = GroceryListResponse.model_validate(gl)
-        response.items = [GroceryItemResponse.model_validate(i) for i in items]
-        result.append(response)
-    return result
+    """
+    Lists with their items. Unpaged by default (newest week first); with `limit`,
+    pages newest-created first and puts the next page's cursor in X-Next-Cursor.
+    """
+    lists = await GroceryService(db).list_all(status=status, limit=limit, before=before, with_items=True)
+    if limit and len(lists) == limit:
+        response.headers["X-Next-Cursor"] = str(lists[-1].id)
+    return lists
 
 
 @router.get("/{list_id}", response_model=GroceryListResponse)
@@ -39,12 +40,7 @@ async def get_grocery_list(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    svc = GroceryService(db)
-    gl = await svc.get(list_id)
-    items = await svc.get_items(list_id)
-    response = GroceryListResponse.model_validate(gl)
-    response.items = [GroceryItemResponse.model_validate(i) for i in items]
-    return response
+    return await GroceryService(db).get(list_id, with_items=True)
 
 
 @router.post("", response_model=GroceryListResponse, status_code=201)
@@ -53,8 +49,7 @@ async def create_grocery_list(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    gl = await GroceryService(db).create_list(data.week_of, data.name)
-    return GroceryListResponse.model_validate(gl)
+    return await GroceryService(db).create_list(data.week_of, data.name)
 
 
 @router.post("/{list_id}/items", response_model=GroceryItemResponse, status_code=201)
@@ -67,6 +62,16 @@ async def add_item(
     return await GroceryService(db).add_item(list_id, data)
 
 
+@router.post("/{list_id}/items/bulk", response_model=list[GroceryItemResponse], status_code=201)
+async def add_items(
+    list_id: int,
+    data: GroceryBulkAdd,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    return await GroceryService(db).add_items(list_id, data)
+
+
 @router.put("/items/{item_id}", response_model=GroceryItemResponse)
 async def update_item(
     item_id: int,
@@ -102,9 +107,13 @@ async def generate_from_meals(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    svc = GroceryService(db)
-    gl = await svc.generate_from_meals(data.week_of, user, data.list_name)
-    items = await svc.get_items(gl.id)
-    response = GroceryListResponse.model_validate(gl)
-    response.items = [GroceryItemResponse.model_validate(i) for i in items]
-    return response
+    """
+    Build a list from the week's meal plans. With `incremental`, update the week's
+    generated list (or `list_id`) in place instead: only items the previous
+    generation created and nobody has touched since are added, updated or removed.
+    Manual, purchased and hand-edited items are never overwritten, and generated
+    items deleted by hand stay deleted unless the meals now need a different amount.
+    """
+    return await GroceryService(db).generate_from_meals(
+        data.week_of, user, data.list_name, incremental=data.incremental, list_id=data.list_id,
+    )
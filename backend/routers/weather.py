@@ -0,0 +1,27 @@
+from datetime import date, datetime
+
+from fastapi import APIRouter, Depends, Query
+
+from backend.deps import get_current_user
+from backend.models.user import User
+from backend.schemas.weather import ForecastResponse
+from backend.services.weather_service import forecast_store, get_weather
+
+router = APIRouter(prefix="/api/weather", tags=["weather"])
+
+
+@router.get("/forecast", response_model=ForecastResponse)
+async def get_forecast(
+    hours: int = Query(48, ge=1, le=168),
+    days: int = Query(7, ge=1, le=7),
+    user: User = Depends(get_current_user),
+):
+    """Hourly and daily forecast from the prefetched store (never waits on Open-Meteo)."""
+    now = datetime.now().replace(minute=0, second=0, microsecond=0)
+    return ForecastResponse(
+        updated_at=forecast_store.updated_at,
+        units=forecast_store.units,
+        current=await get_weather(wait=False),
+        hourly=forecast_store.hourly_from(now, hours),
+        daily=forecast_store.daily_from(date.today(), days),
+    )
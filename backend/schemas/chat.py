@@ -1,8 +1,11 @@
+from datetime import datetime
+
 from pydantic import BaseModel
 
 
 class ChatRequest(BaseModel):
     message: str
+    conversation_id: int | None = None  # continue a stored conversation; omit to start one
 
 
 class ChatAction(BaseModel):
@@ -10,6 +13,40 @@ class ChatAction(BaseModel):
     summary: str
 
 
+class ChatUsage(BaseModel):
+    """Token usage summed over every model call in the turn."""
+    input_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    output_tokens: int = 0
+    iterations: int = 0
+
+
 class ChatResponse(BaseModel):
     response: str
     actions_taken: list[ChatAction] = []
+    usage: ChatUsage | None = None
+    conversation_id: int | None = None
+
+
+class ConversationResponse(BaseModel):
+    id: int
+    title: str
+    summary: str | None = None
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class ConversationMessageResponse(BaseModel):
+    id: int
+    role: str
+    content: str | list
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class ConversationDetailResponse(ConversationResponse):
+    messages: list[ConversationMessageResponse] = []
@@ -2,14 +2,18 @@ from pydantic import BaseModel
 
 
 class WeatherData(BaseModel):
+    temp: int | None = None  # in `units`, like feels_like/high/low
     temp_f: int
     desc: str
     icon: str
     humidity: int
     feels_like: int
+    wind_speed: int | None = None  # mph (imperial) or km/h (metric)
     wind_mph: int
+    units: str = "imperial"
     high: int | None = None
     low: int | None = None
+    daily: list = []  # next days from the prefetched forecast
 
 
 class DashboardResponse(BaseModel):
@@ -21,3 +25,4 @@ class DashboardResponse(BaseModel):
     expiring_pantry: list = []
     outdoor_this_week: dict = {}
     maintenance_due: list = []
+    unavailable: list[str] = []  # widgets that failed or timed out
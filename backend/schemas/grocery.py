@@ -10,6 +10,12 @@ class GroceryItemCreate(BaseModel):
     is_manual: bool = False
 
 
+class GroceryBulkAdd(BaseModel):
+    """Several items at once: structured items, pasted text (one item per line), or both"""
+    items: list[GroceryItemCreate] = []
+    text: str | None = None
+
+
 class GroceryItemUpdate(BaseModel):
     item_name: str | None = None
     category: str | None = None
@@ -56,3 +62,5 @@ class GenerateFromMealsRequest(BaseModel):
     """Generate grocery list from a week's meal plans"""
     week_of: date
     list_name: str | None = None
+    incremental: bool = False  # update the week's generated list in place
+    list_id: int | None = None  # list to update (default: the newest generated for week_of)
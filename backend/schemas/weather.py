@@ -0,0 +1,32 @@
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class HourlyForecast(BaseModel):
+    time: str
+    temp: int | None = None
+    feels_like: int | None = None
+    humidity: int | None = None
+    precip_prob: int | None = None
+    wind: int | None = None
+    code: int | None = None
+    desc: str | None = None
+    icon: str | None = None
+
+
+class DailyForecast(BaseModel):
+    date: str
+    high: int | None = None
+    low: int | None = None
+    precip_prob: int | None = None
+    code: int | None = None
+    desc: str | None = None
+    icon: str | None = None
+
+
+class ForecastResponse(BaseModel):
+    updated_at: datetime | None = None
+    units: str
+    current: dict | None = None
+    hourly: list[HourlyForecast] = []
+    daily: list[DailyForecast] = []
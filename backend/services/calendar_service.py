@@ -1,18 +1,313 @@
-from datetime import datetime, timedelta, date
+from bisect import bisect_left
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, date, time
+from time import monotonic
 import asyncio
 import logging
+import threading
 
 from fastapi import HTTPException
-from sqlalchemy import select
+from sqlalchemy import select, delete, and_, or_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 import caldav
+from caldav.elements import dav
+import icalendar
+import recurring_ical_events
 
-from backend.models.calendar import CalendarSource
+from backend.models.calendar import CalendarSource, CalendarSyncState, CachedCalendarEvent
 from backend.models.user import User
 from backend.schemas.calendar import CalendarSourceCreate, CalendarSourceUpdate, CalendarEvent
+from backend.services.dashboard_cache import invalidate_dashboard
 
 logger = logging.getLogger(__name__)
 
+# caldav is blocking; all CalDAV I/O runs on this bounded pool so one slow
+# server can't starve the default executor.
+CALDAV_WORKERS = 8
+SOURCE_DEADLINE_SECONDS = 10.0
+
+# Occurrences kept in the in-memory index, relative to today.
+INDEX_DAYS_BEHIND = 31
+INDEX_DAYS_AHEAD = 120
+EXPANSION_BLOCK_DAYS = 64  # recurring series are expanded over fixed, day-aligned blocks of this size
+
+# How long discovered calendar collections are trusted before re-running
+# principal/calendar-home discovery.
+DISCOVERY_TTL_SECONDS = 3600.0
+
+_caldav_pool = ThreadPoolExecutor(max_workers=CALDAV_WORKERS, thread_name_prefix="caldav")
+
+
+class CaldavClientPool:
+    """One authenticated DAVClient per source, with its discovered calendars.
+
+    The client's HTTP session (and its keep-alive connections) is reused across
+    requests, and principal/calendar discovery is only repeated after
+    DISCOVERY_TTL_SECONDS, so a view costs one REPORT per calendar. Entries are
+    keyed by source id and checked against the source's URL and credentials.
+    """
+
+    def __init__(self, ttl: float = DISCOVERY_TTL_SECONDS):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: dict[int, tuple[tuple, caldav.DAVClient, list | None, float]] = {}
+
+    @staticmethod
+    def _fingerprint(source: CalendarSource) -> tuple:
+        return (source.caldav_url, source.username, source.password)
+
+    def client(self, source: CalendarSource) -> caldav.DAVClient:
+        fingerprint = self._fingerprint(source)
+        with self._lock:
+            entry = self._entries.get(source.id)
+            if entry and entry[0] == fingerprint:
+                return entry[1]
+            if entry:
+                self._close(entry[1])
+            client = caldav.DAVClient(
+                url=source.caldav_url,
+                username=source.username,
+                password=source.password,
+                timeout=SOURCE_DEADLINE_SECONDS,
+            )
+            self._entries[source.id] = (fingerprint, client, None, 0.0)
+            return client
+
+    def calendars(self, source: CalendarSource) -> list:
+        """Discovered calendars for a source (blocking; call from the CalDAV pool)."""
+        client = self.client(source)
+        with self._lock:
+            entry = self._entries.get(source.id)
+            if entry and entry[1] is client and entry[2] is not None and monotonic() - entry[3] < self.ttl:
+                return entry[2]
+
+        calendars = client.principal().calendars()
+        with self._lock:
+            entry = self._entries.get(source.id)
+            if entry and entry[1] is client:
+                self._entries[source.id] = (entry[0], client, calendars, monotonic())
+        return calendars
+
+    def invalidate(self, source_id: int):
+        with self._lock:
+            entry = self._entries.pop(source_id, None)
+        if entry:
+            self._close(entry[1])
+
+    def clear(self):
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            self._close(entry[1])
+
+    @staticmethod
+    def _close(client: caldav.DAVClient):
+        try:
+            client.close()
+        except Exception:
+            pass
+
+
+caldav_clients = CaldavClientPool()
+
+
+def _aware(value: date | datetime | None) -> datetime | None:
+    """Normalize iCalendar/DB/query times to aware datetimes (floating and all-day times are local)."""
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, time.min)
+    if value.tzinfo is None:
+        value = value.astimezone()
+    return value
+
+
+def _text(component, name: str) -> str | None:
+    value = component.get(name)
+    return str(value) if value is not None else None
+
+
+def _component_times(component) -> tuple[datetime, datetime | None, bool]:
+    dtstart = component.decoded("DTSTART")
+    if "DTEND" in component:
+        dtend = component.decoded("DTEND")
+    elif "DURATION" in component:
+        dtend = dtstart + component.decoded("DURATION")
+    else:
+        dtend = None
+    all_day = isinstance(dtstart, date) and not isinstance(dtstart, datetime)
+    return _aware(dtstart), _aware(dtend), all_day
+
+
+def _component_fields(component) -> tuple:
+    """Source-independent fields of one VEVENT (or expanded occurrence)."""
+    start, end, all_day = _component_times(component)
+    return (
+        _text(component, "UID") or "",
+        _text(component, "SUMMARY") or "Untitled",
+        start,
+        end,
+        _text(component, "LOCATION"),
+        _text(component, "DESCRIPTION"),
+        all_day,
+    )
+
+
+def _event(fields: tuple, source: CalendarSource) -> CalendarEvent:
+    uid, summary, start, end, location, description, all_day = fields
+    return CalendarEvent(
+        uid=uid,
+        summary=summary,
+        start=start,
+        end=end,
+        location=location,
+        description=description,
+        source_name=source.name,
+        source_color=source.color,
+        all_day=all_day,
+    )
+
+
+def _event_from_row(row: CachedCalendarEvent, source: CalendarSource) -> CalendarEvent:
+    return _event(
+        (row.uid, row.summary, row.starts_at, row.ends_at, row.location, row.description, row.all_day),
+        source,
+    )
+
+
+def _master_and_recurrence(cal: icalendar.Calendar):
+    """The series master of a resource and its recurrence lines (None if it doesn't recur)."""
+    vevents = list(cal.walk("VEVENT"))
+    if not vevents:
+        return None, None
+    master = next((v for v in vevents if v.get("RECURRENCE-ID") is None), vevents[0])
+    recurrence = [
+        line
+        for line in master.to_ical().decode().splitlines()
+        if line.startswith(("RRULE", "RDATE", "EXDATE"))
+    ]
+    if not recurrence and len(vevents) > 1:
+        recurrence = ["RECURRENCE-ID overrides"]
+    return master, "\n".join(recurrence) or None
+
+
+def _expansion_window(start: datetime, end: datetime) -> tuple[datetime, datetime]:
+    """The block-aligned window covering [start, end); the same for every query inside it."""
+    block = EXPANSION_BLOCK_DAYS
+    first = start.date().toordinal() // block * block
+    last = -(-(end.date().toordinal() + 1) // block) * block
+    return (
+        datetime.combine(date.fromordinal(first), time.min, tzinfo=start.tzinfo),
+        datetime.combine(date.fromordinal(last), time.min, tzinfo=end.tzinfo),
+    )
+
+
+class ExpansionCache:
+    """LRU of expanded recurring series keyed by (uid, rrule, version, aligned window).
+
+    version is the resource's etag (or a content hash when there is none), so an
+    edited occurrence or override invalidates the entry even if the RRULE didn't
+    change. Series are expanded over day-aligned EXPANSION_BLOCK_DAYS blocks rather
+    than the exact query range, so "now"-based queries keep hitting the same entry;
+    results can therefore extend past [start, end) and callers filter them. Shared
+    by the index builder, mirror queries and the live CalDAV path (which runs on
+    pool threads, hence the lock).
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple, tuple[tuple, ...]] = OrderedDict()
+
+    def expand(
+        self, uid: str, rrule: str, version: str, ical: str | icalendar.Calendar, start: datetime, end: datetime
+    ) -> tuple[tuple, ...]:
+        start, end = _expansion_window(start, end)
+        key = (uid, rrule, version, start, end)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        cal = ical if isinstance(ical, icalendar.Calendar) else icalendar.Calendar.from_ical(ical)
+        occurrences = tuple(_component_fields(c) for c in recurring_ical_events.of(cal).between(start, end))
+        with self._lock:
+            self._entries[key] = occurrences
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return occurrences
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+expansion_cache = ExpansionCache()
+
+
+def _occurrences(row: CachedCalendarEvent, source: CalendarSource, start: datetime, end: datetime) -> list[CalendarEvent]:
+    """Occurrences of a cached resource inside [start, end)."""
+    if not row.rrule:
+        return [_event_from_row(row, source)]
+    try:
+        occurrences = expansion_cache.expand(row.uid, row.rrule, row.etag or str(hash(row.ical)), row.ical, start, end)
+    except Exception as e:
+        logger.debug(f"Failed to expand {row.uid}: {e}")
+        return []
+    return [_event(fields, source) for fields in occurrences]
+
+
+def _overlaps(event: CalendarEvent, start: datetime, end: datetime) -> bool:
+    if event.start >= end:
+        return False
+    return event.end > start if event.end else event.start >= start
+
+
+class EventIndex:
+    """A user's cached occurrences for the index window, sorted by start.
+
+    Range queries bisect on start, reaching back by the longest event duration
+    so multi-day events that began before the range are still found.
+    """
+
+    def __init__(
+        self,
+        window_start: datetime,
+        window_end: datetime,
+        events: list[CalendarEvent],
+        unsynced_source_ids: set[int],
+    ):
+        self.window_start = window_start
+        self.window_end = window_end
+        self.events = sorted(events, key=lambda e: e.start)
+        self.starts = [e.start for e in self.events]
+        self.max_duration = max(
+            ((e.end - e.start) for e in self.events if e.end and e.end > e.start),
+            default=timedelta(0),
+        )
+        self.unsynced_source_ids = unsynced_source_ids
+
+    def covers(self, start: datetime, end: datetime) -> bool:
+        return self.window_start <= start and end <= self.window_end
+
+    def query(self, start: datetime, end: datetime) -> list[CalendarEvent]:
+        lo = bisect_left(self.starts, start - self.max_duration)
+        hi = bisect_left(self.starts, end)
+        return [e for e in self.events[lo:hi] if _overlaps(e, start, end)]
+
+
+# user_id → index; rebuilt lazily after a sync or source change drops it.
+_event_indexes: dict[int, EventIndex] = {}
+
+
+def invalidate_event_index(user_id: int | None = None):
+    if user_id is None:
+        _event_indexes.clear()
+    else:
+        _event_indexes.pop(user_id, None)
+
 
 class CalendarService:
     def __init__(self, db: AsyncSession):
@@ -36,11 +331,14 @@ class CalendarService:
         )
         self.db.add(source)
         await self.db.commit()
+        invalidate_event_index(user.id)
+        invalidate_dashboard("upcoming_events")
         await self.db.refresh(source)
         return source
 
     async def update_source(self, source_id: int, data: CalendarSourceUpdate, user: User) -> CalendarSource:
-        source = await self.db.get(CalendarSource, source_id)
+        # Row lock: serializes with a sync pass applying pulls for this source
+        source = await self.db.get(CalendarSource, source_id, with_for_update=True)
         if not source or source.user_id != user.id:
             raise HTTPException(status_code=404, detail="Calendar source not found")
 
@@ -48,7 +346,16 @@ class CalendarService:
         for key, value in update_data.items():
             setattr(source, key, value)
 
+        # New server or account: drop the mirror so the source is served live
+        # until the sync worker has pulled it again.
+        if {"caldav_url", "username", "password"} & update_data.keys():
+            caldav_clients.invalidate(source_id)
+            await self.db.execute(delete(CachedCalendarEvent).where(CachedCalendarEvent.source_id == source_id))
+            await self.db.execute(delete(CalendarSyncState).where(CalendarSyncState.source_id == source_id))
+
         await self.db.commit()
+        invalidate_event_index(user.id)
+        invalidate_dashboard("upcoming_events")
         await self.db.refresh(source)
         return source
 
@@ -58,6 +365,9 @@ class CalendarService:
             raise HTTPException(status_code=404, detail="Calendar source not found")
         await self.db.delete(source)
         await self.db.commit()
+        caldav_clients.invalidate(source_id)
+        invalidate_event_index(user.id)
+        invalidate_dashboard("upcoming_events")
         return {"ok": True}
 
     async def get_events(
@@ -66,90 +376,153 @@ class CalendarService:
         start: datetime | None = None,
         end: datetime | None = None,
     ) -> list[CalendarEvent]:
-        """Fetch events from all active CalDAV sources for a user."""
+        """Events for a user's active sources, served from the local mirror.
+
+        Sources the sync worker hasn't pulled yet are fetched live from CalDAV.
+        """
         if start is None:
             start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
         if end is None:
             end = start + timedelta(days=7)
+        start, end = _aware(start), _aware(end)
 
-        sources = await self.list_sources(user_id)
-        active_sources = [s for s in sources if s.is_active]
+        index = await self._get_index(user_id)
+        if index.covers(start, end):
+            all_events = index.query(start, end)
+        else:
+            all_events = await self._query_mirror(user_id, start, end)
 
-        if not active_sources:
-            return []
-
-        all_events: list[CalendarEvent] = []
-        for source in active_sources:
-            try:
-                events = await asyncio.to_thread(
-                    self._fetch_caldav_events, source, start, end
-                )
-                all_events.extend(events)
-            except Exception as e:
-                logger.warning(f"Failed to fetch from {source.name}: {e}")
+        if index.unsynced_source_ids:
+            sources = [s for s in await self.list_sources(user_id) if s.id in index.unsynced_source_ids]
+            # Fan out across sources; each source fans out across its calendars.
+            results = await asyncio.gather(
+                *(self._fetch_source(source, start, end) for source in sources)
+            )
+            all_events.extend(event for events in results for event in events)
 
         # Sort by start time
         all_events.sort(key=lambda e: e.start)
         return all_events
 
-    def _fetch_caldav_events(
-        self, source: CalendarSource, start: datetime, end: datetime
+    async def _get_index(self, user_id: int) -> EventIndex:
+        index = _event_indexes.get(user_id)
+        today = _aware(date.today())
+        if index is None or index.window_start != today - timedelta(days=INDEX_DAYS_BEHIND):
+            index = await self._build_index(
+                user_id,
+                today - timedelta(days=INDEX_DAYS_BEHIND),
+                today + timedelta(days=INDEX_DAYS_AHEAD),
+            )
+            _event_indexes[user_id] = index
+        return index
+
+    async def _build_index(self, user_id: int, window_start: datetime, window_end: datetime) -> EventIndex:
+        sources = {s.id: s for s in await self.list_sources(user_id) if s.is_active}
+        if not sources:
+            return EventIndex(window_start, window_end, [], set())
+
+        result = await self.db.execute(
+            select(CalendarSyncState.source_id).where(CalendarSyncState.source_id.in_(sources)).distinct()
+        )
+        synced = set(result.scalars().all())
+
+        events = await self._query_mirror(user_id, window_start, window_end, sources)
+        return EventIndex(window_start, window_end, events, set(sources) - synced)
+
+    async def _query_mirror(
+        self,
+        user_id: int,
+        start: datetime,
+        end: datetime,
+        sources: dict[int, CalendarSource] | None = None,
     ) -> list[CalendarEvent]:
-        """Synchronous CalDAV fetch (runs in thread pool)."""
+        """Range query against the mirrored events table, expanding recurring series."""
+        if sources is None:
+            sources = {s.id: s for s in await self.list_sources(user_id) if s.is_active}
+        if not sources:
+            return []
+
+        result = await self.db.execute(
+            select(CachedCalendarEvent).where(
+                and_(
+                    CachedCalendarEvent.source_id.in_(sources),
+                    CachedCalendarEvent.starts_at < end,
+                    or_(
+                        CachedCalendarEvent.rrule != None,
+                        func.coalesce(CachedCalendarEvent.ends_at, CachedCalendarEvent.starts_at) >= start,
+                    ),
+                )
+            )
+        )
         events: list[CalendarEvent] = []
+        for row in result.scalars().all():
+            events.extend(
+                e for e in _occurrences(row, sources[row.source_id], start, end) if _overlaps(e, start, end)
+            )
+        return events
 
+    async def _fetch_source(
+        self, source: CalendarSource, start: datetime, end: datetime
+    ) -> list[CalendarEvent]:
+        """Fetch one source live within its deadline; a failing or slow source yields no events."""
         try:
-            client = caldav.DAVClient(
-                url=source.caldav_url,
-                username=source.username,
-                password=source.password,
+            return await asyncio.wait_for(
+                self._fetch_source_calendars(source, start, end),
+                timeout=SOURCE_DEADLINE_SECONDS,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to fetch from {source.name}: {e!r}")
+            # Rediscover next time in case a calendar moved or the session went bad
+            caldav_clients.invalidate(source.id)
+            return []
+
+    async def _fetch_source_calendars(
+        self, source: CalendarSource, start: datetime, end: datetime
+    ) -> list[CalendarEvent]:
+        loop = asyncio.get_running_loop()
+        calendars = await loop.run_in_executor(_caldav_pool, caldav_clients.calendars, source)
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(_caldav_pool, self._search_calendar, source, cal, start, end)
+                for cal in calendars
             )
-            principal = client.principal()
-            calendars = principal.calendars()
-
-            for cal in calendars:
-                try:
-                    results = cal.date_search(start=start, end=end, expand=True)
-                    for event in results:
-                        try:
-                            vevent = event.vobject_instance.vevent
-                            summary = str(vevent.summary.value) if hasattr(vevent, 'summary') else "Untitled"
-                            uid = str(vevent.uid.value) if hasattr(vevent, 'uid') else ""
-
-                            dtstart = vevent.dtstart.value
-                            dtend = vevent.dtend.value if hasattr(vevent, 'dtend') else None
-
-                            # Check if it's an all-day event
-                            all_day = isinstance(dtstart, date) and not isinstance(dtstart, datetime)
-
-                            if all_day:
-                                dtstart = datetime.combine(dtstart, datetime.min.time())
-                                if dtend and isinstance(dtend, date) and not isinstance(dtend, datetime):
-                                    dtend = datetime.combine(dtend, datetime.min.time())
-
-                            location = str(vevent.location.value) if hasattr(vevent, 'location') else None
-                            description = str(vevent.description.value) if hasattr(vevent, 'description') else None
-
-                            events.append(CalendarEvent(
-                                uid=uid,
-                                summary=summary,
-                                start=dtstart,
-                                end=dtend,
-                                location=location,
-                                description=description,
-                                source_name=source.name,
-                                source_color=source.color,
-                                all_day=all_day,
-                            ))
-                        except Exception as e:
-                            logger.debug(f"Failed to parse event: {e}")
-                except Exception as e:
-                    logger.debug(f"Failed to search calendar: {e}")
+        )
+        return [event for events in results for event in events]
+
+    def _search_calendar(
+        self, source: CalendarSource, cal, start: datetime, end: datetime
+    ) -> list[CalendarEvent]:
+        """Synchronous search of one calendar (runs in the CalDAV pool).
 
+        Recurring series are fetched unexpanded and expanded locally through the
+        shared expansion cache instead of asking the server to expand them.
+        """
+        events: list[CalendarEvent] = []
+        try:
+            results = cal.date_search(start=start, end=end, expand=False)
         except Exception as e:
-            logger.warning(f"CalDAV connection failed for {source.name}: {e}")
+            logger.debug(f"Failed to search calendar: {e}")
+            return events
 
-        return events
+        for resource in results:
+            try:
+                ical = icalendar.Calendar.from_ical(resource.data)
+                master, rrule = _master_and_recurrence(ical)
+                if master is None:
+                    continue
+                if rrule is None:
+                    occurrences = [_component_fields(master)]
+                else:
+                    etag = (getattr(resource, "props", None) or {}).get(dav.GetEtag.tag)
+                    uid = _text(master, "UID") or str(resource.url)
+                    occurrences = expansion_cache.expand(
+                        uid, rrule, etag or str(hash(resource.data)), ical, start, end
+                    )
+                events.extend(_event(fields, source) for fields in occurrences)
+            except Exception as e:
+                logger.debug(f"Failed to parse event: {e}")
+
+        return [e for e in events if _overlaps(e, start, end)]
 
     async def get_upcoming(self, user_id: int, days: int = 3) -> list[CalendarEvent]:
         """Get upcoming events for the dashboard."""
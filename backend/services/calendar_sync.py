@@ -0,0 +1,273 @@
+"""
+Background CalDAV sync into the local calendar_events mirror.
+
+Each calendar is pulled incrementally with its RFC 6578 sync-token. Servers
+without sync-collection support fall back to a CalendarServer ctag check and,
+only when the ctag moved, a full listing diffed by href. CalDAV I/O and iCal
+parsing run on the CalDAV thread pool; all DB writes happen on the event loop.
+"""
+
+import asyncio
+import logging
+
+from caldav.elements import dav
+from caldav.elements.base import ValuedBaseElement
+import icalendar
+from sqlalchemy import select, delete, and_, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database import async_session
+from backend.models.calendar import CalendarSource, CalendarSyncState, CachedCalendarEvent
+from backend.services.calendar_service import (
+    _caldav_pool, _component_times, _master_and_recurrence, _text, caldav_clients, invalidate_event_index,
+)
+from backend.services.dashboard_cache import invalidate_dashboard
+
+logger = logging.getLogger(__name__)
+
+UPSERT_CHUNK = 200
+FAKE_SYNC_TOKEN_PREFIX = "fake-"  # caldav's emulated token after a full listing
+
+
+class GetCTag(ValuedBaseElement):
+    tag = "{http://calendarserver.org/ns/}getctag"
+
+
+class CalendarPull:
+    """Changes pulled from one calendar since its last sync cursor."""
+
+    def __init__(
+        self,
+        calendar_url: str,
+        ctag: str | None,
+        sync_token: str | None,
+        upserts: list[dict],
+        deletes: list[str],
+        full: bool,
+    ):
+        self.calendar_url = calendar_url
+        self.ctag = ctag
+        self.sync_token = sync_token
+        self.upserts = upserts
+        self.deletes = deletes
+        self.full = full  # upserts are the complete contents; anything else cached is gone
+
+    @property
+    def changed(self) -> bool:
+        return self.full or bool(self.upserts) or bool(self.deletes)
+
+
+def _parse_resource(href: str, etag: str | None, data: str) -> dict | None:
+    """Flatten one iCalendar resource into a calendar_events row (sans source/calendar)."""
+    master, rrule = _master_and_recurrence(icalendar.Calendar.from_ical(data))
+    if master is None:
+        return None
+    start, end, all_day = _component_times(master)
+    return {
+        "href": href,
+        "etag": etag,
+        "uid": _text(master, "UID") or href,
+        "summary": (_text(master, "SUMMARY") or "Untitled")[:500],
+        "starts_at": start,
+        "ends_at": end,
+        "all_day": all_day,
+        "location": _text(master, "LOCATION"),
+        "description": _text(master, "DESCRIPTION"),
+        "rrule": rrule,
+        "ical": data,
+    }
+
+
+def _collect(objects) -> tuple[list[dict], list[str]]:
+    upserts, deletes = [], []
+    for obj in objects:
+        href = str(obj.url)
+        if obj.data is None:
+            # sync-collection reports deleted resources; loading them 404s
+            deletes.append(href)
+            continue
+        etag = (getattr(obj, "props", None) or {}).get(dav.GetEtag.tag)
+        try:
+            row = _parse_resource(href, etag, obj.data)
+        except Exception as e:
+            logger.debug(f"Failed to parse {href}: {e}")
+            continue
+        if row:
+            upserts.append(row)
+    return upserts, deletes
+
+
+def _server_token(token: str | None) -> str | None:
+    """A sync-token the server issued; caldav's emulated "fake-" tokens only stand for a full listing."""
+    return token if token and not str(token).startswith(FAKE_SYNC_TOKEN_PREFIX) else None
+
+
+def _pull_calendar(cal, ctag: str | None, sync_token: str | None) -> CalendarPull:
+    url = str(cal.url)
+    sync_token = _server_token(sync_token)
+    try:
+        new_ctag = cal.get_property(GetCTag())
+    except Exception:
+        new_ctag = None
+    if new_ctag and new_ctag == ctag:
+        return CalendarPull(url, ctag, sync_token, [], [], full=False)
+
+    for token in ([sync_token, None] if sync_token else [None]):
+        try:
+            # Without disable_fallback caldav answers an unsupported or expired
+            # sync-collection with every object and a fake token instead of raising
+            objects = cal.objects_by_sync_token(sync_token=token, load_objects=True, disable_fallback=True)
+        except Exception as e:
+            # Expired token (retry from scratch) or no sync-collection support
+            logger.debug(f"sync-collection failed for {url}: {e}")
+            continue
+        upserts, deletes = _collect(objects)
+        return CalendarPull(url, new_ctag, _server_token(objects.sync_token), upserts, deletes, full=token is None)
+
+    upserts, _ = _collect(cal.events())
+    return CalendarPull(url, new_ctag, None, upserts, [], full=True)
+
+
+def _pull_source(
+    source: CalendarSource, cursors: dict[str, tuple[str | None, str | None]],
+) -> tuple[list[str], list[CalendarPull]]:
+    """
+    Synchronous pull of every calendar in a source (runs in the CalDAV pool).
+    Returns the URLs of all discovered calendars (including ones whose pull failed) and the pulls.
+    """
+    calendars = caldav_clients.calendars(source)
+    pulls = []
+    for cal in calendars:
+        ctag, token = cursors.get(str(cal.url), (None, None))
+        try:
+            pulls.append(_pull_calendar(cal, ctag, token))
+        except Exception as e:
+            logger.warning(f"Calendar sync failed for {source.name} {cal.url}: {e!r}")
+    return [str(cal.url) for cal in calendars], pulls
+
+
+def _fingerprint(source: CalendarSource) -> tuple:
+    """What a pull depends on; if it changed while pulling, the pull belongs to the old account."""
+    return (source.caldav_url, source.username, source.password, source.is_active)
+
+
+class CalendarSyncService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def sync_all(self):
+        """Pull every active source concurrently, then apply the changes in one transaction."""
+        result = await self.db.execute(select(CalendarSource).where(CalendarSource.is_active == True))
+        sources = list(result.scalars().all())
+        if not sources:
+            return
+
+        result = await self.db.execute(
+            select(CalendarSyncState).where(CalendarSyncState.source_id.in_([s.id for s in sources]))
+        )
+        cursors: dict[int, dict[str, tuple[str | None, str | None]]] = {}
+        for state in result.scalars().all():
+            cursors.setdefault(state.source_id, {})[state.calendar_url] = (state.ctag, state.sync_token)
+
+        pulled_with = {s.id: _fingerprint(s) for s in sources}
+        loop = asyncio.get_running_loop()
+        pulled = await asyncio.gather(
+            *(loop.run_in_executor(_caldav_pool, _pull_source, s, cursors.get(s.id, {})) for s in sources),
+            return_exceptions=True,
+        )
+
+        changed_users: set[int] = set()
+        for source, outcome in zip(sources, pulled):
+            if isinstance(outcome, BaseException):
+                logger.warning(f"Calendar sync failed for {source.name}: {outcome!r}")
+                caldav_clients.invalidate(source.id)
+                continue
+            # Lock the source row until commit: an update_source that changed the
+            # account mid-pull has either committed (and we skip) or waits for us.
+            current = (await self.db.execute(
+                select(CalendarSource)
+                .where(CalendarSource.id == source.id)
+                .with_for_update()
+                .execution_options(populate_existing=True)
+            )).scalar_one_or_none()
+            if current is None or _fingerprint(current) != pulled_with[source.id]:
+                logger.info(f"Calendar source {source.id} changed during sync; discarding its pull")
+                continue
+
+            calendar_urls, pulls = outcome
+            if await self._prune(source.id, calendar_urls):
+                changed_users.add(source.user_id)
+            for pull in pulls:
+                await self._apply(source.id, pull)
+                if pull.changed:
+                    changed_users.add(source.user_id)
+
+        await self.db.commit()
+        for user_id in changed_users:
+            invalidate_event_index(user_id)
+        if changed_users:
+            invalidate_dashboard("upcoming_events")
+
+    async def _prune(self, source_id: int, calendar_urls: list[str]) -> bool:
+        """Drop mirrored events and cursors of calendars the server no longer lists."""
+        removed = await self.db.execute(
+            delete(CachedCalendarEvent).where(
+                and_(CachedCalendarEvent.source_id == source_id, CachedCalendarEvent.calendar_url.not_in(calendar_urls))
+            )
+        )
+        await self.db.execute(
+            delete(CalendarSyncState).where(
+                and_(CalendarSyncState.source_id == source_id, CalendarSyncState.calendar_url.not_in(calendar_urls))
+            )
+        )
+        return bool(removed.rowcount)
+
+    async def _apply(self, source_id: int, pull: CalendarPull):
+        events = CachedCalendarEvent
+        if pull.full:
+            seen = [row["href"] for row in pull.upserts]
+            await self.db.execute(
+                delete(events).where(
+                    and_(events.source_id == source_id, events.calendar_url == pull.calendar_url, events.href.not_in(seen))
+                )
+            )
+        if pull.deletes:
+            await self.db.execute(
+                delete(events).where(and_(events.source_id == source_id, events.href.in_(pull.deletes)))
+            )
+
+        for i in range(0, len(pull.upserts), UPSERT_CHUNK):
+            rows = [
+                {**row, "source_id": source_id, "calendar_url": pull.calendar_url}
+                for row in pull.upserts[i:i + UPSERT_CHUNK]
+            ]
+            stmt = pg_insert(events).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_calendar_events_source_href",
+                set_={
+                    col: stmt.excluded[col]
+                    for col in rows[0]
+                    if col not in ("source_id", "href")
+                } | {"updated_at": func.now()},
+            )
+            await self.db.execute(stmt)
+
+        stmt = pg_insert(CalendarSyncState).values(
+            source_id=source_id, calendar_url=pull.calendar_url, ctag=pull.ctag, sync_token=pull.sync_token,
+        ).on_conflict_do_update(
+            constraint="uq_calendar_sync_state_source_calendar",
+            set_={"ctag": pull.ctag, "sync_token": pull.sync_token, "synced_at": func.now()},
+        )
+        await self.db.execute(stmt)
+
+
+async def run_calendar_sync(interval_seconds: float):
+    """Background loop keeping the local calendar mirror current."""
+    while True:
+        try:
+            async with async_session() as db:
+                await CalendarSyncService(db).sync_all()
+        except Exception as e:
+            logger.warning(f"Calendar sync pass failed: {e!r}")
+        await asyncio.sleep(interval_seconds)
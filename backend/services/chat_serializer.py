@@ -0,0 +1,97 @@
+"""
+Compact JSON for chat tool results.
+
+Each model has a registered projection: the columns the assistant actually
+needs, with None values dropped and long text clipped. Long lists are paged
+so one lookup can't flood the context window; the model is told how many
+results there are and can ask for the next page with `offset`.
+"""
+
+from decimal import Decimal
+
+import orjson
+from pydantic import BaseModel
+
+from backend.models.chore import Chore, ChoreCompletion
+from backend.models.grocery import GroceryList, GroceryItem
+from backend.models.home import Appliance, MaintenanceTask, MaintenanceLog
+from backend.models.meal import MealPlan, Recipe
+from backend.models.outdoor import OutdoorSession
+from backend.models.pantry import PantryItem
+
+PAGE_SIZE = 40
+MAX_TEXT_CHARS = 400
+
+PROJECTIONS: dict[type, tuple[str, ...]] = {}
+
+
+def register_projection(model: type, *fields: str):
+    """Declare which columns of a model are sent to the assistant."""
+    PROJECTIONS[model] = fields
+
+
+register_projection(Chore, "id", "title", "description", "frequency", "assigned_to", "category", "priority",
+                    "next_due", "last_done")
+register_projection(ChoreCompletion, "id", "chore_id", "completed_by", "completed_at", "notes")
+register_projection(MealPlan, "id", "plan_date", "meal_type", "meal_name", "recipe_id", "notes")
+register_projection(Recipe, "id", "name", "description", "ingredients", "prep_time_min", "cook_time_min",
+                    "servings", "tags", "is_favorite")
+register_projection(GroceryList, "id", "week_of", "name", "status")
+register_projection(GroceryItem, "id", "list_id", "item_name", "category", "quantity", "is_purchased", "notes")
+register_projection(PantryItem, "id", "item_name", "category", "quantity", "unit", "storage_location",
+                    "expiration_date", "is_opened", "notes")
+register_projection(OutdoorSession, "id", "session_date", "start_time", "end_time", "duration_minutes",
+                    "location", "activity", "weather")
+register_projection(Appliance, "id", "name", "category", "brand", "model_number", "location", "warranty_until")
+register_projection(MaintenanceTask, "id", "appliance_id", "title", "frequency", "next_due", "last_done",
+                    "estimated_cost", "vendor")
+register_projection(MaintenanceLog, "id", "task_id", "description", "performed_date", "cost")
+
+
+def _clip(value):
+    if isinstance(value, str) and len(value) > MAX_TEXT_CHARS:
+        return value[:MAX_TEXT_CHARS] + "…"
+    return value
+
+
+def project(obj):
+    """Reduce ORM objects (at any depth in lists/dicts) to their registered projection."""
+    fields = PROJECTIONS.get(type(obj))
+    if fields is not None:
+        values = ((name, getattr(obj, name)) for name in fields)
+        return {name: _clip(value) for name, value in values if value is not None}
+    if isinstance(obj, (list, tuple)):
+        return [project(item) for item in obj]
+    if isinstance(obj, dict):
+        return {key: project(value) for key, value in obj.items()}
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(exclude_none=True)
+    if hasattr(obj, "__table__"):
+        # Unregistered model: every column, still without SQLAlchemy state
+        return {c.key: _clip(getattr(obj, c.key)) for c in obj.__table__.columns if getattr(obj, c.key) is not None}
+    return obj
+
+
+def _default(obj):
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return str(obj)
+
+
+def dumps(obj) -> str:
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def serialize_tool_result(result, offset: int = 0, page_size: int = PAGE_SIZE) -> str:
+    """Projected, compact JSON for a tool result; lists longer than a page are paginated."""
+    if isinstance(result, list) and (offset or len(result) > page_size):
+        page = result[offset:offset + page_size]
+        payload = {"items": project(page), "total": len(result), "offset": offset}
+        if offset + len(page) < len(result):
+            payload["next_offset"] = offset + len(page)
+        return dumps(payload)
+    if isinstance(result, str):
+        return result
+    return dumps(project(result))
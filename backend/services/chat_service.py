@@ -2,16 +2,20 @@
 Chat service using Claude's tool_use API to drive actions across all Home Hub modules.
 """
 
-import json
+import asyncio
 import logging
+from collections.abc import AsyncIterator
 from datetime import date, timedelta
 
-import httpx
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.config import settings
+from backend.database import async_session
 from backend.models.user import User
+from backend.services.chat_serializer import dumps, serialize_tool_result
 from backend.services.chore_service import ChoreService
+from backend.services.conversation_service import ConversationService, compact_in_background
+from backend.services.llm_backend import USAGE_FIELDS, LLMBackend, MessageAssembler, get_llm_backend
 from backend.services.meal_service import MealService
 from backend.services.recipe_service import RecipeService
 from backend.services.grocery_service import GroceryService
@@ -28,8 +32,6 @@ logger = logging.getLogger(__name__)
 
 SYSTEM_PROMPT = """You are the Home Hub assistant for the Bonifacic family. You help manage their household by using the available tools.
 
-Today's date is {today}.
-
 Guidelines:
 - Be concise and friendly. Use short responses.
 - When the user asks a question, use the appropriate tool to get data, then answer naturally.
@@ -41,6 +43,11 @@ Guidelines:
 - For "this week", use the Monday of the current week as the start date.
 """
 
+DATE_PROMPT = "Today's date is {today}."
+
+SUMMARY_CONTEXT_PROMPT = """Summary of earlier messages in this conversation:
+{summary}"""
+
 # ── Tool definitions for Claude API ─────────────────────────────
 
 TOOLS = [
@@ -306,6 +313,111 @@ TOOLS = [
     },
 ]
 
+# List tools page long results (see chat_serializer.PAGE_SIZE); the model
+# follows next_offset to read further.
+PAGINATED_TOOLS = frozenset({
+    "list_chores",
+    "search_recipes",
+    "get_grocery_lists",
+    "list_pantry",
+    "get_expiring_pantry",
+    "list_maintenance_tasks",
+    "list_appliances",
+})
+
+for _tool in TOOLS:
+    if _tool["name"] in PAGINATED_TOOLS:
+        _tool["input_schema"]["properties"]["offset"] = {
+            "type": "integer",
+            "description": "Skip this many results; use next_offset from a previous page",
+        }
+
+
+# ── Request payload ─────────────────────────────────────────────
+#
+# The prompt-cache prefix is tools → system → messages. Tool definitions and
+# the static system prompt carry cache breakpoints, and are serialized once
+# here; only the date block and the message history are encoded per request.
+# A third breakpoint on the newest message caches the history as the tool
+# loop grows it.
+
+MODEL = "claude-sonnet-4-20250514"
+MAX_TOKENS = 4096
+CACHE_CONTROL = {"type": "ephemeral"}
+
+
+_TOOLS_PAYLOAD = [*TOOLS[:-1], {**TOOLS[-1], "cache_control": CACHE_CONTROL}]
+_REQUEST_PREFIX = (
+    dumps({"model": MODEL, "max_tokens": MAX_TOKENS, "stream": True})[:-1]
+    + ',"tools":' + dumps(_TOOLS_PAYLOAD)
+    + ',"system":[' + dumps({"type": "text", "text": SYSTEM_PROMPT, "cache_control": CACHE_CONTROL})
+)
+
+
+def _with_history_breakpoint(messages: list[dict]) -> list[dict]:
+    """Copy of messages with a cache breakpoint on the last content block (the originals stay unmarked)."""
+    last = messages[-1]
+    content = last["content"]
+    if isinstance(content, str):
+        content = [{"type": "text", "text": content}]
+    content = [*content[:-1], {**content[-1], "cache_control": CACHE_CONTROL}]
+    return [*messages[:-1], {**last, "content": content}]
+
+
+def _request_body(messages: list[dict], summary: str | None = None) -> bytes:
+    context = DATE_PROMPT.format(today=date.today().isoformat())
+    if summary:
+        context += "\n\n" + SUMMARY_CONTEXT_PROMPT.format(summary=summary)
+    return (
+        _REQUEST_PREFIX + "," + dumps({"type": "text", "text": context})
+        + '],"messages":' + dumps(_with_history_breakpoint(messages)) + "}"
+    ).encode()
+
+
+# Tools that only read. Consecutive read-only calls in one model response run
+# concurrently, each on its own session; every other tool is a barrier and
+# runs alone, in order, on the request's session.
+READ_ONLY_TOOLS = frozenset({
+    "list_chores",
+    "get_meals",
+    "search_recipes",
+    "get_grocery_lists",
+    "list_pantry",
+    "get_expiring_pantry",
+    "get_outdoor_stats",
+    "list_maintenance_tasks",
+    "list_appliances",
+})
+
+# Data each tool reads or writes. Read results are memoized for the rest of
+# the turn; a mutating tool drops the memo for every domain it touches.
+TOOL_DOMAINS: dict[str, tuple[str, ...]] = {
+    "list_chores": ("chores",),
+    "complete_chore": ("chores",),
+    "create_chore": ("chores",),
+    "get_meals": ("meals",),
+    "generate_meal_plan": ("meals",),
+    "create_meal": ("meals",),
+    "search_recipes": ("recipes",),
+    "get_grocery_lists": ("grocery",),
+    "generate_grocery_list": ("grocery",),
+    "list_pantry": ("pantry",),
+    "add_pantry_item": ("pantry",),
+    "mark_pantry_consumed": ("pantry",),
+    "get_expiring_pantry": ("pantry",),
+    "get_outdoor_stats": ("outdoor",),
+    "log_outdoor_session": ("outdoor",),
+    "list_maintenance_tasks": ("home",),
+    "complete_maintenance_task": ("home",),
+    "list_appliances": ("home",),
+}
+
+
+def _memo_key(name: str, inp: dict) -> str:
+    """Tool name plus its input with defaults (None) dropped and keys sorted."""
+    normalized = {k: v for k, v in inp.items() if v is not None}
+    return name + ":" + orjson.dumps(normalized, option=orjson.OPT_SORT_KEYS).decode()
+
 
 def _monday_of_week() -> date:
     """Get Monday of the current week."""
@@ -313,29 +425,11 @@ def _monday_of_week() -> date:
     return today - timedelta(days=today.weekday())
 
 
-def _serialize(obj) -> str:
-    """JSON-serialize an ORM object or dict for Claude tool results."""
-    if isinstance(obj, dict):
-        return json.dumps(obj, default=str)
-    if isinstance(obj, list):
-        items = []
-        for item in obj:
-            if hasattr(item, "__dict__"):
-                d = {k: v for k, v in item.__dict__.items() if not k.startswith("_")}
-                items.append(d)
-            else:
-                items.append(item)
-        return json.dumps(items, default=str)
-    if hasattr(obj, "__dict__"):
-        d = {k: v for k, v in obj.__dict__.items() if not k.startswith("_")}
-        return json.dumps(d, default=str)
-    return str(obj)
-
-
 class ChatService:
-    def __init__(self, db: AsyncSession, user: User):
+    def __init__(self, db: AsyncSession, user: User, llm: LLMBackend | None = None):
         self.db = db
         self.user = user
+        self.llm = llm or get_llm_backend()
         self.chores = ChoreService(db)
         self.meals = MealService(db)
         self.recipes = RecipeService(db)
@@ -344,15 +438,108 @@ class ChatService:
         self.outdoor = OutdoorService(db)
         self.home = HomeService(db)
         self.actions_taken: list[dict] = []
+        # domain -> memo key -> serialized result, for the current turn
+        self._tool_memo: dict[str, dict[str, str]] = {}
 
     async def _execute_tool(self, tool_name: str, tool_input: dict) -> str:
         """Execute a tool and return the result as a string for Claude."""
         try:
             result = await self._dispatch_tool(tool_name, tool_input)
-            return _serialize(result)
+            return self._serialize_result(result, tool_input)
         except Exception as e:
             logger.error(f"Tool {tool_name} failed: {e}")
-            return json.dumps({"error": str(e)})
+            return dumps({"error": str(e)})
+
+    def _serialize_result(self, result, tool_input: dict) -> str:
+        return serialize_tool_result(result, offset=tool_input.get("offset") or 0)
+
+    async def _execute_isolated(self, tool_name: str, tool_input: dict) -> tuple[str, list[dict]]:
+        """Execute a read-only tool on a fresh session so it can run alongside others."""
+        async with async_session() as db:
+            worker = type(self)(db, self.user, self.llm)
+            result = await worker._execute_tool(tool_name, tool_input)
+            return result, worker.actions_taken
+
+    async def _execute_memoized(self, call: dict, isolated: bool) -> tuple[str, list[dict]]:
+        """
+        Execute a tool call, serving repeated reads from the turn's memo.
+
+        Returns (result, actions). Non-isolated calls have already appended their
+        actions to self.actions_taken; isolated ones leave that to the caller.
+        Memo hits add no actions, since nothing new was done.
+        """
+        name, inp = call["name"], call["input"]
+        domains = TOOL_DOMAINS.get(name, ())
+        key = _memo_key(name, inp)
+        if name in READ_ONLY_TOOLS:
+            for domain in domains:
+                if key in self._tool_memo.get(domain, {}):
+                    logger.info(f"Chat tool memo hit: {name}")
+                    return self._tool_memo[domain][key], []
+
+        if isolated:
+            result_str, actions = await self._execute_isolated(name, inp)
+        else:
+            actions_before = len(self.actions_taken)
+            result_str = await self._execute_tool(name, inp)
+            actions = self.actions_taken[actions_before:]
+
+        if name in READ_ONLY_TOOLS:
+            if not result_str.startswith('{"error"'):
+                for domain in domains:
+                    self._tool_memo.setdefault(domain, {})[key] = result_str
+        else:
+            for domain in domains:
+                self._tool_memo.pop(domain, None)
+        return result_str, actions
+
+    def _tool_batches(self, calls: list[dict]) -> list[list[dict]]:
+        """Split tool_use blocks into runs of read-only calls and single mutating calls."""
+        batches: list[list[dict]] = []
+        for call in calls:
+            if call["name"] in READ_ONLY_TOOLS and batches and batches[-1][0]["name"] in READ_ONLY_TOOLS:
+                batches[-1].append(call)
+            else:
+                batches.append([call])
+        return batches
+
+    async def _run_tool_calls(self, calls: list[dict]) -> AsyncIterator[dict]:
+        """
+        Execute one response's tool calls, yielding tool_start/tool_done progress
+        and finally {"type": "results", "results": [...]} in the original call order.
+        actions_taken is extended in call order too, whatever order calls finish in.
+        """
+        results: list[dict] = []
+        for batch in self._tool_batches(calls):
+            for call in batch:
+                logger.info(f"Chat executing tool: {call['name']}({call['input']})")
+                yield {"type": "tool_start", "id": call["id"], "tool": call["name"], "input": call["input"]}
+
+            if len(batch) == 1:
+                call = batch[0]
+                outcomes = [await self._execute_memoized(call, isolated=False)]
+                yield {"type": "tool_done", "id": call["id"], "tool": call["name"], "actions": outcomes[0][1]}
+            else:
+                async def run(index: int, call: dict):
+                    return index, await self._execute_memoized(call, isolated=True)
+
+                outcomes = [None] * len(batch)
+                for next_done in asyncio.as_completed([run(i, call) for i, call in enumerate(batch)]):
+                    index, outcome = await next_done
+                    outcomes[index] = outcome
+                    call = batch[index]
+                    yield {"type": "tool_done", "id": call["id"], "tool": call["name"], "actions": outcome[1]}
+                for _, actions in outcomes:
+                    self.actions_taken.extend(actions)
+
+            for call, (result_str, _) in zip(batch, outcomes):
+                results.append({
+                    "type": "tool_result",
+                    "tool_use_id": call["id"],
+                    "content": result_str,
+                })
+
+        yield {"type": "results", "results": results}
 
     async def _dispatch_tool(self, name: str, inp: dict):
         """Route tool call to the appropriate service method."""
@@ -513,91 +700,124 @@ class ChatService:
         else:
             return {"error": f"Unknown tool: {name}"}
 
-    async def chat(self, message: str) -> dict:
+    def _build_request(self, messages: list[dict], summary: str | None) -> bytes:
+        return _request_body(messages, summary)
+
+    async def _stream_message(self, messages: list[dict], summary: str | None = None) -> AsyncIterator[dict]:
         """
-        Process a chat message using Claude's tool_use API.
-        Returns {"response": str, "actions_taken": list}.
+        One streamed model call through the configured LLM backend.
+
+        Yields {"type": "text", "text": ...} for each text delta, then a final
+        {"type": "message", "content": [...], "stop_reason": ..., "usage": {...}}
+        with the content blocks reassembled into the same shape as a
+        non-streamed response.
+        """
+        assembler = MessageAssembler()
+        async for event in self.llm.stream(self._build_request(messages, summary)):
+            text = assembler.feed(event)
+            if text:
+                yield {"type": "text", "text": text}
+
+        yield {"type": "message", **assembler.result()}
+
+    async def chat_stream(self, message: str, conversation_id: int | None = None) -> AsyncIterator[dict]:
+        """
+        Process a chat message, yielding progress as it happens:
+        text deltas, tool_start/tool_done around each tool call, and a final
+        {"type": "done", "response": str, "actions_taken": list, "usage": dict,
+        "conversation_id": int}.
+
+        The turn continues the stored conversation (a new one if conversation_id
+        is None): its summary and recent exchanges are sent as context, and the
+        turn's messages are appended to it. A new conversation is only stored
+        once the turn completes.
         """
         self.actions_taken = []
+        self._tool_memo = {}
 
-        system = SYSTEM_PROMPT.format(today=date.today().isoformat())
+        conversations = ConversationService(self.db)
+        conversation = await conversations.get(conversation_id, self.user) if conversation_id is not None else None
+        summary, history = await conversations.context(conversation) if conversation else (None, [])
 
-        messages = [{"role": "user", "content": message}]
+        messages = [*history, {"role": "user", "content": message}]
+        turn_start = len(history)
+        usage = dict.fromkeys(USAGE_FIELDS, 0) | {"iterations": 0}
 
         max_iterations = 10
+        response = "I've been working on this for a while. Let me know if you need anything else!"
 
         for iteration in range(max_iterations):
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                resp = await client.post(
-                    "https://api.anthropic.com/v1/messages",
-                    headers={
-                        "x-api-key": settings.anthropic_api_key,
-                        "anthropic-version": "2023-06-01",
-                        "content-type": "application/json",
-                    },
-                    json={
-                        "model": "claude-sonnet-4-20250514",
-                        "max_tokens": 4096,
-                        "system": system,
-                        "tools": TOOLS,
-                        "messages": messages,
-                    },
-                )
-                resp.raise_for_status()
-                data = resp.json()
-
-            # Check stop reason
-            stop_reason = data.get("stop_reason", "end_turn")
+            data = None
+            async for event in self._stream_message(messages, summary):
+                if event["type"] == "message":
+                    data = event
+                else:
+                    yield event
 
-            if stop_reason == "end_turn":
-                # Extract text response
-                text_parts = []
-                for block in data.get("content", []):
-                    if block["type"] == "text":
-                        text_parts.append(block["text"])
+            for key, value in data["usage"].items():
+                usage[key] += value
+            usage["iterations"] += 1
+
+            content = data["content"]
+            stop_reason = data["stop_reason"]
+            text = "\n".join(block["text"] for block in content if block["type"] == "text")
 
-                return {
-                    "response": "\n".join(text_parts) if text_parts else "Done!",
-                    "actions_taken": self.actions_taken,
-                }
+            if stop_reason == "end_turn":
+                response = text or "Done!"
+                if content:
+                    messages.append({"role": "assistant", "content": content})
+                break
 
             elif stop_reason == "tool_use":
                 # Add assistant's response to conversation
-                messages.append({"role": "assistant", "content": data["content"]})
+                messages.append({"role": "assistant", "content": content})
 
                 # Process all tool calls
                 tool_results = []
-                for block in data.get("content", []):
-                    if block["type"] == "tool_use":
-                        tool_name = block["name"]
-                        tool_input = block["input"]
-                        tool_id = block["id"]
-
-                        logger.info(f"Chat executing tool: {tool_name}({tool_input})")
-                        result_str = await self._execute_tool(tool_name, tool_input)
-
-                        tool_results.append({
-                            "type": "tool_result",
-                            "tool_use_id": tool_id,
-                            "content": result_str,
-                        })
+                calls = [block for block in content if block["type"] == "tool_use"]
+                async for event in self._run_tool_calls(calls):
+                    if event["type"] == "results":
+                        tool_results = event["results"]
+                    else:
+                        yield event
 
                 # Add tool results to conversation
                 messages.append({"role": "user", "content": tool_results})
 
             else:
                 # Unexpected stop reason
-                text_parts = []
-                for block in data.get("content", []):
-                    if block["type"] == "text":
-                        text_parts.append(block["text"])
-                return {
-                    "response": "\n".join(text_parts) if text_parts else "Something unexpected happened.",
-                    "actions_taken": self.actions_taken,
-                }
-
-        # Max iterations reached
-        return {
-            "response": "I've been working on this for a while. Let me know if you need anything else!",
+                response = text or "Something unexpected happened."
+                break
+
+        if messages[-1]["role"] == "user":
+            # Keep stored history alternating so the next turn is a valid request
+            messages.append({"role": "assistant", "content": [{"type": "text", "text": response}]})
+        if conversation is None:
+            conversation = await conversations.create(self.user, message)
+        await conversations.append(conversation, messages[turn_start:])
+        # Fold old exchanges into the summary if needed, without holding up the reply
+        compact_in_background(conversation.id)
+
+        logger.info(
+            f"Chat turn: {usage['iterations']} calls, {usage['input_tokens']} input tokens "
+            f"(+{usage['cache_read_input_tokens']} cached, +{usage['cache_creation_input_tokens']} written), "
+            f"{usage['output_tokens']} output tokens"
+        )
+        yield {
+            "type": "done",
+            "response": response,
             "actions_taken": self.actions_taken,
+            "usage": usage,
+            "conversation_id": conversation.id,
         }
+
+    async def chat(self, message: str, conversation_id: int | None = None) -> dict:
+        """
+        Process a chat message using Claude's tool_use API.
+        Returns {"response": str, "actions_taken": list, "usage": dict, "conversation_id": int}.
+        """
+        result = {}
+        async for event in self.chat_stream(message, conversation_id):
+            if event["type"] == "done":
+                result = event
+        return {key: result[key] for key in ("response", "actions_taken", "usage", "conversation_id")}
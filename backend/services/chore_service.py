@@ -7,6 +7,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from backend.models.chore import Chore, ChoreCompletion, FREQUENCY_DAYS
 from backend.models.user import User
 from backend.schemas.chore import ChoreCreate, ChoreUpdate
+from backend.services.dashboard_cache import invalidate_dashboard
+from backend.services.event_hub import publish
 
 
 class ChoreService:
@@ -53,6 +55,7 @@ class ChoreService:
         )
         self.db.add(chore)
         await self.db.commit()
+        invalidate_dashboard("overdue_chores", "due_today_chores")
         await self.db.refresh(chore)
         return chore
 
@@ -67,6 +70,7 @@ class ChoreService:
             setattr(chore, key, value)
 
         await self.db.commit()
+        invalidate_dashboard("overdue_chores", "due_today_chores")
         await self.db.refresh(chore)
         return chore
 
@@ -74,6 +78,7 @@ class ChoreService:
         chore = await self.get(chore_id)
         chore.is_active = False
         await self.db.commit()
+        invalidate_dashboard("overdue_chores", "due_today_chores")
         return {"ok": True}
 
     async def mark_complete(self, chore_id: int, user: User, notes: str | None = None, source: str = "manual") -> dict:
@@ -96,14 +101,17 @@ class ChoreService:
             chore.next_due = None
 
         await self.db.commit()
+        invalidate_dashboard("overdue_chores", "due_today_chores")
         await self.db.refresh(chore)
 
-        return {
+        result = {
             "ok": True,
             "chore_id": chore.id,
             "next_due": str(chore.next_due) if chore.next_due else None,
             "last_done": str(chore.last_done),
         }
+        publish("chores", "chore_completed", {**result, "completed_by": user.username})
+        return result
 
     async def get_completions(self, chore_id: int) -> list[ChoreCompletion]:
         result = await self.db.execute(
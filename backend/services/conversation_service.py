@@ -0,0 +1,203 @@
+"""
+Stored chat conversations and the bounded context window sent to the model.
+
+Every Messages API turn (typed text, assistant tool_use, tool_result) is kept
+verbatim so follow-ups can reuse earlier tool results instead of re-querying.
+What is sent back is a sliding window of the newest whole exchanges within
+CONTEXT_TOKEN_BUDGET; older exchanges are folded into a running summary.
+"""
+
+import asyncio
+import json
+import logging
+
+from fastapi import HTTPException
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database import async_session
+from backend.http_clients import ANTHROPIC_MESSAGES_URL, anthropic_headers, http_clients
+from backend.models.chat import ChatConversation, ChatMessage
+from backend.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Estimated tokens of stored history sent with each request.
+CONTEXT_TOKEN_BUDGET = 12000
+# Once unsummarized history exceeds the budget, fold the oldest exchanges so
+# only this much remains; leaves headroom so compaction isn't needed every turn.
+COMPACT_TARGET_TOKENS = 6000
+SUMMARY_MODEL = "claude-sonnet-4-20250514"
+SUMMARY_MAX_TOKENS = 600
+SUMMARY_TOOL_RESULT_CHARS = 1500
+
+SUMMARY_PROMPT = """You maintain the running memory of a household assistant chat.
+
+Current summary:
+{summary}
+
+Older messages leaving the context window:
+{transcript}
+
+Write an updated summary in at most 200 words. Keep facts the user may refer back to:
+names, dates, IDs of chores/meals/lists/items, results of lookups and actions taken.
+Return only the summary."""
+
+
+def estimate_tokens(content: str | list) -> int:
+    """Rough token count (~4 characters per token) of a message's content."""
+    text = content if isinstance(content, str) else json.dumps(content, separators=(",", ":"), default=str)
+    return len(text) // 4 + 4
+
+
+def _starts_exchange(message: ChatMessage) -> bool:
+    # Typed user messages are stored as plain strings; tool results are block lists.
+    # Windows only start here so tool_use/tool_result pairs are never split.
+    return message.role == "user" and isinstance(message.content, str)
+
+
+def _window_start(messages: list[ChatMessage], budget: int) -> int:
+    """Index of the oldest message in the newest whole exchanges that fit in budget."""
+    total = 0
+    start = len(messages)
+    for i in range(len(messages) - 1, -1, -1):
+        total += messages[i].token_estimate
+        if total > budget:
+            break
+        if _starts_exchange(messages[i]):
+            start = i
+    return start
+
+
+def _transcript(messages: list[ChatMessage]) -> str:
+    lines = []
+    for m in messages:
+        if isinstance(m.content, str):
+            lines.append(f"{m.role}: {m.content}")
+            continue
+        for block in m.content:
+            if block.get("type") == "text":
+                lines.append(f"{m.role}: {block['text']}")
+            elif block.get("type") == "tool_use":
+                lines.append(f"assistant called {block['name']}({json.dumps(block.get('input', {}))})")
+            elif block.get("type") == "tool_result":
+                lines.append(f"tool result: {str(block.get('content', ''))[:SUMMARY_TOOL_RESULT_CHARS]}")
+    return "\n".join(lines)
+
+
+class ConversationService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def list_all(self, user: User, limit: int = 50) -> list[ChatConversation]:
+        result = await self.db.execute(
+            select(ChatConversation)
+            .where(ChatConversation.user_id == user.id)
+            .order_by(ChatConversation.updated_at.desc())
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def get(self, conversation_id: int, user: User) -> ChatConversation:
+        conversation = await self.db.get(ChatConversation, conversation_id)
+        if not conversation or conversation.user_id != user.id:
+            raise HTTPException(status_code=404, detail="Conversation not found")
+        return conversation
+
+    async def create(self, user: User, first_message: str) -> ChatConversation:
+        """A new conversation, flushed for its id; committed with its first messages by append()."""
+        conversation = ChatConversation(user_id=user.id, title=first_message.strip()[:200] or "New chat")
+        self.db.add(conversation)
+        await self.db.flush()
+        return conversation
+
+    async def delete(self, conversation_id: int, user: User) -> dict:
+        conversation = await self.get(conversation_id, user)
+        await self.db.delete(conversation)
+        await self.db.commit()
+        return {"ok": True}
+
+    async def messages(self, conversation: ChatConversation, after_id: int = 0) -> list[ChatMessage]:
+        result = await self.db.execute(
+            select(ChatMessage)
+            .where(ChatMessage.conversation_id == conversation.id, ChatMessage.id > after_id)
+            .order_by(ChatMessage.id)
+        )
+        return list(result.scalars().all())
+
+    async def context(self, conversation: ChatConversation) -> tuple[str | None, list[dict]]:
+        """The running summary and the newest whole exchanges within the token budget."""
+        stored = await self.messages(conversation, after_id=conversation.summarized_through)
+        window = stored[_window_start(stored, CONTEXT_TOKEN_BUDGET):]
+        return conversation.summary, [{"role": m.role, "content": m.content} for m in window]
+
+    async def append(self, conversation: ChatConversation, messages: list[dict]):
+        for m in messages:
+            self.db.add(ChatMessage(
+                conversation_id=conversation.id,
+                role=m["role"],
+                content=m["content"],
+                token_estimate=estimate_tokens(m["content"]),
+            ))
+        conversation.updated_at = func.now()
+        await self.db.commit()
+
+    async def compact(self, conversation: ChatConversation):
+        """Fold exchanges beyond COMPACT_TARGET_TOKENS into the summary once history outgrows the budget."""
+        stored = await self.messages(conversation, after_id=conversation.summarized_through)
+        if sum(m.token_estimate for m in stored) <= CONTEXT_TOKEN_BUDGET:
+            return
+        keep_from = _window_start(stored, COMPACT_TARGET_TOKENS)
+        folded = stored[:keep_from]
+        if not folded:
+            return
+
+        try:
+            resp = await http_clients.get("anthropic").post(
+                ANTHROPIC_MESSAGES_URL,
+                headers=anthropic_headers(),
+                json={
+                    "model": SUMMARY_MODEL,
+                    "max_tokens": SUMMARY_MAX_TOKENS,
+                    "messages": [{
+                        "role": "user",
+                        "content": SUMMARY_PROMPT.format(
+                            summary=conversation.summary or "(none)",
+                            transcript=_transcript(folded),
+                        ),
+                    }],
+                },
+                timeout=60.0,
+            )
+            resp.raise_for_status()
+            summary = "".join(b["text"] for b in resp.json().get("content", []) if b["type"] == "text").strip()
+        except Exception as e:
+            # The window keeps sliding without it; the next turn retries.
+            logger.warning(f"Conversation {conversation.id} summary failed: {e!r}")
+            return
+
+        conversation.summary = summary or conversation.summary
+        conversation.summarized_through = folded[-1].id
+        await self.db.commit()
+
+
+_compactions: dict[int, asyncio.Task] = {}
+
+
+def compact_in_background(conversation_id: int):
+    """Run compact() on its own session and task so the chat turn doesn't wait for the summary call."""
+    if conversation_id in _compactions:
+        return
+    task = asyncio.create_task(_compact(conversation_id))
+    _compactions[conversation_id] = task
+    task.add_done_callback(lambda _: _compactions.pop(conversation_id, None))
+
+
+async def _compact(conversation_id: int):
+    try:
+        async with async_session() as db:
+            conversation = await db.get(ChatConversation, conversation_id)
+            if conversation:
+                await ConversationService(db).compact(conversation)
+    except Exception as e:
+        logger.warning(f"Conversation {conversation_id} compaction failed: {e!r}")
@@ -0,0 +1,64 @@
+"""
+In-process dashboard snapshot, invalidated per widget by the service write paths.
+"""
+
+import time
+from datetime import date
+from typing import Any
+
+from backend.services.event_hub import publish
+
+
+class DashboardCache:
+    """Per-user snapshot of built dashboard widgets.
+
+    Entries are dropped when a write path calls invalidate() for their widget,
+    when the day rolls over (overdue/due-today/expiring depend on today's date),
+    or when they exceed the widget's max_age.
+    """
+
+    def __init__(self):
+        self._snapshots: dict[int, dict[str, tuple[date, float, Any]]] = {}
+        # Bumped on every invalidation so a build that started before a write
+        # can't store its (now stale) result afterwards.
+        self._versions: dict[str, int] = {}
+
+    def version(self, widget: str) -> int:
+        return self._versions.get(widget, 0)
+
+    def get(self, user_id: int, widget: str, max_age: float | None = None) -> tuple[bool, Any]:
+        entry = self._snapshots.get(user_id, {}).get(widget)
+        if entry is None:
+            return False, None
+        built_on, built_at, value = entry
+        if built_on != date.today():
+            return False, None
+        if max_age is not None and time.monotonic() - built_at > max_age:
+            return False, None
+        return True, value
+
+    def put(self, user_id: int, widget: str, value: Any, version: int):
+        if version != self.version(widget):
+            return
+        self._snapshots.setdefault(user_id, {})[widget] = (date.today(), time.monotonic(), value)
+
+    def invalidate(self, *widgets: str):
+        for widget in widgets:
+            self._versions[widget] = self.version(widget) + 1
+            for snapshot in self._snapshots.values():
+                snapshot.pop(widget, None)
+
+    def clear(self):
+        for widget in list(self._versions):
+            self._versions[widget] += 1
+        self._snapshots.clear()
+
+
+dashboard_cache = DashboardCache()
+
+
+def invalidate_dashboard(*widgets: str):
+    """Drop the named widgets from every user's snapshot (household data is shared)
+    and tell open dashboards which widgets to refetch."""
+    dashboard_cache.invalidate(*widgets)
+    publish("dashboard", "widgets_changed", {"widgets": list(widgets)})
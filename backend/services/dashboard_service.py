@@ -0,0 +1,181 @@
+"""
+Dashboard assembly: builds every widget concurrently so the page costs max(widget), not sum(widget),
+and serves unchanged widgets from the in-process snapshot.
+"""
+
+import asyncio
+import logging
+from datetime import date
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database import async_session
+from backend.models.user import User
+from backend.services.chore_service import ChoreService
+from backend.services.meal_service import MealService
+from backend.services.outdoor_service import OutdoorService
+from backend.services.pantry_service import PantryService
+from backend.services.home_service import HomeService
+from backend.services.calendar_service import CalendarService
+from backend.services.dashboard_cache import dashboard_cache
+from backend.services.weather_service import forecast_store, get_weather
+
+logger = logging.getLogger(__name__)
+
+MEAL_TYPE_ORDER = {"breakfast": 0, "lunch": 1, "dinner": 2, "snack": 3}
+
+# Pooled connections all dashboard loads together may hold for widgets
+# (the engine's pool is 5 + 10 overflow; leave the rest for other requests).
+DB_WIDGET_CONCURRENCY = 4
+_db_widget_slots = asyncio.Semaphore(DB_WIDGET_CONCURRENCY)
+
+
+class WidgetUnavailable(Exception):
+    """Raised by a builder that has nothing to show yet; the widget is reported unavailable and not cached."""
+
+
+# ── Widget builders ──────────────────────────────────────────
+# Each builder gets its own session (or None for non-DB widgets) and returns
+# the JSON-ready value for its key in the dashboard payload.
+
+async def _weather(db: AsyncSession | None, user: User):
+    # The prefetcher keeps this warm; never hold the page for Open-Meteo.
+    weather = await get_weather(wait=False)
+    if weather is None:
+        raise WidgetUnavailable("weather cache is still cold")
+    return {**weather, "daily": forecast_store.daily_from(date.today(), 3)}
+
+
+async def _overdue_chores(db: AsyncSession, user: User):
+    overdue = await ChoreService(db).get_overdue()
+    return [
+        {"id": c.id, "title": c.title, "next_due": str(c.next_due), "assigned_to": c.assigned_to, "category": c.category}
+        for c in overdue
+    ]
+
+
+async def _due_today_chores(db: AsyncSession, user: User):
+    due_today = await ChoreService(db).get_due_today()
+    return [
+        {"id": c.id, "title": c.title, "assigned_to": c.assigned_to, "category": c.category}
+        for c in due_today
+    ]
+
+
+async def _todays_meals(db: AsyncSession, user: User):
+    todays_meals = await MealService(db).get_today()
+    return sorted(
+        [{"id": m.id, "meal_type": m.meal_type, "meal_name": m.meal_name} for m in todays_meals],
+        key=lambda x: MEAL_TYPE_ORDER.get(x["meal_type"], 9),
+    )
+
+
+async def _upcoming_events(db: AsyncSession, user: User):
+    upcoming_events = await CalendarService(db).get_upcoming(user.id, days=3)
+    return [
+        {"uid": e.uid, "summary": e.summary, "start": e.start.isoformat(), "source_name": e.source_name, "source_color": e.source_color}
+        for e in upcoming_events[:5]
+    ]
+
+
+async def _expiring_pantry(db: AsyncSession, user: User):
+    expiring = await PantryService(db).get_expiring(days_ahead=7)
+    return [
+        {"id": p.id, "item_name": p.item_name, "expiration_date": str(p.expiration_date), "storage_location": p.storage_location}
+        for p in expiring[:5]
+    ]
+
+
+async def _outdoor_this_week(db: AsyncSession, user: User):
+    return await OutdoorService(db).get_week_summary()
+
+
+async def _maintenance_due(db: AsyncSession, user: User):
+    maint_due = await HomeService(db).get_due_soon(days_ahead=14)
+    return [
+        {"id": t.id, "title": t.title, "next_due": str(t.next_due) if t.next_due else None}
+        for t in maint_due[:5]
+    ]
+
+
+@dataclass(frozen=True)
+class Widget:
+    """One dashboard section: how to build it, how long to wait, and what to show if it fails.
+
+    max_age bounds how long a cached snapshot is trusted. DB widgets are invalidated
+    by the service write paths, so their max_age is only a safety net for writes made
+    outside the app; external widgets (weather, CalDAV) rely on it entirely.
+    """
+    build: Callable[[AsyncSession | None, User], Awaitable[Any]]
+    default: Callable[[], Any]
+    timeout: float = 5.0
+    needs_db: bool = True
+    max_age: float | None = 900.0
+
+
+# Insertion order is the payload key order.
+WIDGETS: dict[str, Widget] = {
+    "weather": Widget(_weather, default=lambda: None, timeout=1.0, needs_db=False, max_age=300.0),
+    "overdue_chores": Widget(_overdue_chores, default=list),
+    "due_today_chores": Widget(_due_today_chores, default=list),
+    "todays_meals": Widget(_todays_meals, default=list),
+    "upcoming_events": Widget(_upcoming_events, default=list, timeout=6.0, max_age=300.0),
+    "expiring_pantry": Widget(_expiring_pantry, default=list),
+    "outdoor_this_week": Widget(_outdoor_this_week, default=dict),
+    "maintenance_due": Widget(_maintenance_due, default=list),
+}
+
+
+class DashboardService:
+    def __init__(self, user: User):
+        self.user = user
+
+    async def _build_widget(self, widget: Widget):
+        if not widget.needs_db:
+            return await widget.build(None, self.user)
+        # Each DB widget gets its own session so queries run in parallel instead of
+        # queueing on one connection, but at most DB_WIDGET_CONCURRENCY at a time
+        # across every dashboard request so simultaneous loads can't drain the pool.
+        async with _db_widget_slots:
+            async with async_session() as db:
+                return await widget.build(db, self.user)
+
+    async def _run_widget(self, name: str) -> tuple[bool, Any]:
+        widget = WIDGETS[name]
+        version = dashboard_cache.version(name)
+        try:
+            value = await asyncio.wait_for(self._build_widget(widget), timeout=widget.timeout)
+        except WidgetUnavailable as e:
+            logger.info(f"Dashboard widget {name} unavailable: {e}")
+            return False, widget.default()
+        except Exception as e:
+            logger.warning(f"Dashboard widget {name} failed: {e!r}")
+            return False, widget.default()
+        dashboard_cache.put(self.user.id, name, value, version)
+        return True, value
+
+    async def build(self) -> dict:
+        """Serve cached widgets and rebuild only the stale ones, concurrently.
+
+        Returns partial results if some widgets fail or time out.
+        """
+        payload: dict[str, Any] = {}
+        stale: list[str] = []
+        for name, widget in WIDGETS.items():
+            hit, value = dashboard_cache.get(self.user.id, name, widget.max_age)
+            payload[name] = value
+            if not hit:
+                stale.append(name)
+
+        unavailable: list[str] = []
+        if stale:
+            results = await asyncio.gather(*(self._run_widget(name) for name in stale))
+            for name, (ok, value) in zip(stale, results):
+                payload[name] = value
+                if not ok:
+                    unavailable.append(name)
+
+        payload["unavailable"] = unavailable
+        return payload
@@ -0,0 +1,88 @@
+"""
+In-process broadcast hub for server-sent events.
+
+Services publish small deltas after they commit; each open /api/events stream
+holds a Subscription. Publishing never blocks: events are encoded once and
+pushed into bounded per-subscriber queues, and a subscriber that falls too far
+behind gets its backlog replaced by a single "resync" event telling the client
+to refetch over REST.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def format_sse(data: dict, event_id: int | None = None, event: str | None = None) -> str:
+    """Encode one server-sent event frame."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, default=str, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+class Subscription:
+    def __init__(self, topics: set[str], max_queue: int):
+        self.topics = topics
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0
+
+    def matches(self, topic: str) -> bool:
+        # "grocery:12" is delivered to subscribers of "grocery:12" and of "grocery".
+        return topic in self.topics or topic.split(":", 1)[0] in self.topics
+
+    def offer(self, frame: str, resync_frame: str):
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            # Slow consumer: drop the backlog rather than grow without bound
+            # or stall the publisher, and tell the client to refetch.
+            self.dropped += self.queue.qsize()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(resync_frame)
+
+
+class EventHub:
+    def __init__(self, max_queue: int = 100):
+        self.max_queue = max_queue
+        self._subscribers: set[Subscription] = set()
+        self._ids = itertools.count(1)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, topics: set[str]) -> Subscription:
+        sub = Subscription(topics, self.max_queue)
+        self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        self._subscribers.discard(sub)
+        if sub.dropped:
+            logger.info(f"SSE subscriber closed after dropping {sub.dropped} events")
+
+    def publish(self, topic: str, event_type: str, data: dict | None = None):
+        targets = [s for s in self._subscribers if s.matches(topic)]
+        if not targets:
+            return
+        event_id = next(self._ids)
+        frame = format_sse({"topic": topic, "type": event_type, "data": data or {}}, event_id)
+        resync = format_sse({"topic": topic, "type": "resync", "data": {}}, event_id)
+        for sub in targets:
+            sub.offer(frame, resync)
+
+
+event_hub = EventHub()
+
+
+def publish(topic: str, event_type: str, data: dict | None = None):
+    """Broadcast a delta to every subscriber of the topic."""
+    event_hub.publish(topic, event_type, data)
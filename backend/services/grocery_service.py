@@ -1,19 +1,30 @@
+import asyncio
+from collections import defaultdict
 from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
 import json
 import logging
+import math
+import re
+import unicodedata
 from urllib.parse import quote_plus
 
 from fastapi import HTTPException
-from sqlalchemy import select, and_
+from sqlalchemy import select, insert, and_, func, inspect, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
-import httpx
 
 from backend.config import settings
-from backend.models.grocery import GroceryList, GroceryItem
-from backend.models.meal import MealPlan
+from backend.http_clients import http_clients
+from backend.models.grocery import GroceryList, GroceryItem, MealIngredientCache
+from backend.models.meal import MealPlan, Recipe
+from backend.models.pantry import PantryItem
 from backend.models.user import User
-from backend.schemas.grocery import GroceryItemCreate, GroceryItemUpdate
+from backend.schemas.grocery import GroceryBulkAdd, GroceryItemCreate, GroceryItemUpdate, GroceryItemResponse
+from backend.services.event_hub import publish
+from backend.services.pantry_service import PantryService
+from backend.services.quantities import QuantityTotal
 
 logger = logging.getLogger(__name__)
 
@@ -148,14 +159,53 @@ MEAL_INGREDIENTS: dict[str, list[dict]] = {
 }
 
 
-def _categorize_item(item_name: str) -> str:
-    """Auto-categorize a grocery item by keyword matching."""
-    name_lower = item_name.lower()
+def normalize_item_name(name: str) -> str:
+    """Canonical form of an item name for matching: casefolded, punctuation as spaces, single-spaced."""
+    return " ".join(_NON_WORD.sub(" ", unicodedata.normalize("NFKC", name).casefold()).split())
+
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+
+
+def _keyword_forms(keyword: str) -> tuple[str, ...]:
+    """A keyword and its plurals (tomato/tomatoes, berry/berries, egg/eggs)."""
+    if keyword.endswith("y") and keyword[-2:-1] not in "aeiou":
+        return keyword, keyword[:-1] + "ies"
+    if keyword.endswith("o"):
+        return keyword, keyword + "s", keyword + "es"
+    if keyword.endswith(("s", "x", "ch", "sh")):
+        return keyword, keyword + "es"
+    return keyword, keyword + "s"
+
+
+def _build_category_matcher() -> tuple[re.Pattern, dict[str, str]]:
+    # The first category listing a keyword owns it ("pepper" is Produce), as before
+    owner: dict[str, str] = {}
     for category, keywords in CATEGORY_KEYWORDS.items():
         for keyword in keywords:
-            if keyword in name_lower:
-                return category
-    return "Pantry"
+            for form in _keyword_forms(normalize_item_name(keyword)):
+                owner.setdefault(form, category)
+    # Longest alternatives first, so at any position the regex takes the longest keyword;
+    # the lookahead reports a match starting at every position, not just non-overlapping ones.
+    alternation = "|".join(re.escape(form) for form in sorted(owner, key=lambda f: (-len(f), f)))
+    return re.compile(rf"(?=\b({alternation})\b)"), owner
+
+
+_CATEGORY_PATTERN, _KEYWORD_CATEGORY = _build_category_matcher()
+
+
+@lru_cache(maxsize=2048)
+def _categorize_normalized(name: str) -> str:
+    matches = [m.group(1) for m in _CATEGORY_PATTERN.finditer(name)]
+    if not matches:
+        return "Pantry"
+    # Longest keyword wins ("peanut butter" over "butter"); ties go to the earliest
+    return _KEYWORD_CATEGORY[max(matches, key=len)]
+
+
+def _categorize_item(item_name: str) -> str:
+    """Auto-categorize a grocery item by whole-word keyword matching."""
+    return _categorize_normalized(normalize_item_name(item_name))
 
 
 def _sprouts_url(item_name: str) -> str:
@@ -168,34 +218,295 @@ def _wholefoods_url(item_name: str) -> str:
     return f"https://www.wholefoodsmarket.com/search?text={quote_plus(item_name)}"
 
 
-def _match_meal(meal_name: str) -> list[dict] | None:
-    """Match a meal name to known ingredient lists."""
-    name_lower = meal_name.lower().strip()
-    # Exact match first
-    if name_lower in MEAL_INGREDIENTS:
-        return MEAL_INGREDIENTS[name_lower]
-    # Partial match
-    for key, ingredients in MEAL_INGREDIENTS.items():
-        if key in name_lower or name_lower in key:
-            return ingredients
-    return None
+def _item_row(
+    list_id: int,
+    name: str,
+    category: str,
+    quantity: str | None,
+    is_manual: bool = False,
+    notes: str | None = None,
+) -> dict:
+    """Column values for a new grocery item, for bulk inserts."""
+    return {
+        "list_id": list_id,
+        "item_name": name,
+        "category": category,
+        "quantity": quantity,
+        "is_purchased": False,
+        "is_manual": is_manual,
+        "notes": notes,
+        "sprouts_url": _sprouts_url(name),
+        "wholefoods_url": _wholefoods_url(name),
+    }
+
+
+_LIST_MARKER = re.compile(r"^\s*(?:(?:[-*•·]|\d+[.)]|\[[ xX]?\])\s*)+")
+
+
+def _pasted_item_names(text: str) -> list[str]:
+    """One item per non-blank line, with bullets, numbering and checkboxes stripped."""
+    names = []
+    for line in text.splitlines():
+        name = _LIST_MARKER.sub("", line, count=1).strip()
+        if name:
+            names.append(name)
+    return names
+
+
+def _on_hand(item: PantryItem) -> str:
+    return " ".join(filter(None, [item.quantity, item.unit])) or "some"
+
+
+def _where(item: PantryItem) -> str:
+    return f" ({item.storage_location})" if item.storage_location else ""
+
+
+def _item_event(item: GroceryItem) -> dict:
+    return GroceryItemResponse.model_validate(item).model_dump(mode="json")
+
+
+_STOPWORDS = frozenset({"a", "an", "and", "the", "with", "of", "on", "in", "for", "n"})
+MEAL_MATCH_THRESHOLD = 0.8  # IDF-weighted share of the entry's name the meal must contain
+FUZZY_TOKEN_SIMILARITY = 0.6  # trigram Dice for a misspelled word ("chiken") to count as the word
+
+
+def _stem(token: str) -> str:
+    """Crude plural folding so "tacos"/"taco" and "berries"/"berry" share a token."""
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("es") and token[-3] in "osxh":
+        return token[:-2]
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def ingredient_key(name: str) -> str:
+    """Key that treats "Carrots" and "carrot" as the same ingredient."""
+    return " ".join(_stem(token) for token in normalize_item_name(name).split())
+
+
+def _meal_tokens(name: str) -> frozenset[str]:
+    return frozenset(_stem(t) for t in name.split() if t not in _STOPWORDS)
+
+
+def _trigrams(name: str) -> frozenset[str]:
+    padded = f" {name} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def _dice(a: frozenset[str], b: frozenset[str]) -> float:
+    return 2 * len(a & b) / (len(a) + len(b)) if a or b else 0.0
+
+
+def _token_matches(query: frozenset[str], entry: frozenset[str]) -> dict[str, str]:
+    """Entry token -> the query token standing for it, exactly or misspelled."""
+    matches = {token: token for token in query & entry}
+    spare = query - entry
+    for token in entry - query:
+        similarity, closest = max(((_dice(_trigrams(token), _trigrams(q)), q) for q in spare), default=(0.0, None))
+        if similarity >= FUZZY_TOKEN_SIMILARITY:
+            matches[token] = closest
+            spare = spare - {closest}
+    return matches
+
+
+class MealIndex:
+    """
+    Inverted index from meal names to ingredient lists.
+
+    Names are indexed by word token and by character trigram; a lookup only
+    considers entries sharing one with the query. An entry matches when the
+    meal contains (exactly or misspelled) most of the entry's name by IDF
+    weight, so "fish tacos" finds "tacos" but a shared "chicken" alone never
+    turns "chicken curry" into "chicken soup". A meal naming an ingredient the
+    entry doesn't use ("beef stir fry" vs a chicken stir fry) is a different
+    dish. Among matches the one covering more of the meal's own name wins,
+    with a small bonus when the meal mentions one of the entry's ingredients.
+    """
+
+    def __init__(self):
+        self._names: list[str] = []
+        self._ingredients: list[list[dict]] = []
+        self._tokens: list[frozenset[str]] = []
+        self._ingredient_tokens: list[frozenset[str]] = []
+        self._ingredient_vocabulary: set[str] = set()
+        self._exact: dict[str, int] = {}
+        self._token_postings: dict[str, list[int]] = defaultdict(list)
+        self._trigram_postings: dict[str, list[int]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, name: str, ingredients: list[dict]):
+        normalized = normalize_item_name(name)
+        if not normalized or not ingredients:
+            return
+        entry = len(self._names)
+        tokens = _meal_tokens(normalized)
+        ingredient_tokens = frozenset().union(
+            *(_meal_tokens(normalize_item_name(i.get("name", ""))) for i in ingredients)
+        )
+        self._names.append(name)
+        self._ingredients.append(ingredients)
+        self._tokens.append(tokens)
+        self._ingredient_tokens.append(ingredient_tokens)
+        self._ingredient_vocabulary.update(ingredient_tokens)
+        self._exact.setdefault(normalized, entry)
+        for token in tokens:
+            self._token_postings[token].append(entry)
+        for trigram in _trigrams(normalized):
+            self._trigram_postings[trigram].append(entry)
+
+    def _idf(self, token: str) -> float:
+        document_frequency = len(self._token_postings.get(token, ())) or 1
+        return math.log(1 + len(self._names) / document_frequency)
+
+    def search(self, meal_name: str) -> tuple[float, list[dict] | None]:
+        """Best (score, ingredients) for a meal name; (0, None) when no entry is covered well enough."""
+        normalized = normalize_item_name(meal_name)
+        if normalized in self._exact:
+            return 1.0, self._ingredients[self._exact[normalized]]
+
+        tokens = _meal_tokens(normalized)
+        candidates: set[int] = set()
+        for trigram in _trigrams(normalized):
+            candidates.update(self._trigram_postings.get(trigram, ()))
+
+        query_weight = sum(self._idf(t) for t in tokens) or 1.0
+        best_score, best_entry = 0.0, None
+        for entry in sorted(candidates):
+            entry_tokens = self._tokens[entry]
+            matches = _token_matches(tokens, entry_tokens)
+            entry_weight = sum(self._idf(t) for t in entry_tokens) or 1.0
+            coverage = sum(self._idf(t) for t in matches) / entry_weight
+            if coverage < MEAL_MATCH_THRESHOLD:
+                continue
+            extra = tokens - set(matches.values())
+            if any(t in self._ingredient_vocabulary and t not in self._ingredient_tokens[entry] for t in extra):
+                continue
+            score = (coverage + 1 - sum(self._idf(t) for t in extra) / query_weight) / 2
+            if tokens & self._ingredient_tokens[entry]:
+                score += 0.05
+            if score > best_score:
+                best_score, best_entry = score, entry
+        if best_entry is None:
+            return 0.0, None
+        return min(best_score, 1.0), self._ingredients[best_entry]
+
+
+BUILTIN_MEALS = MealIndex()
+for _meal, _meal_ingredients in MEAL_INGREDIENTS.items():
+    BUILTIN_MEALS.add(_meal, _meal_ingredients)
+
+
+def _match_meal(meal_name: str, recipes: MealIndex | None = None) -> list[dict] | None:
+    """Match a meal name to saved recipes first, then the built-in ingredient lists."""
+    recipe_score, recipe_ingredients = recipes.search(meal_name) if recipes else (0.0, None)
+    builtin_score, builtin_ingredients = BUILTIN_MEALS.search(meal_name)
+    if recipe_ingredients and recipe_score >= builtin_score:
+        return recipe_ingredients
+    return builtin_ingredients
+
+
+class JsonObjectStream:
+    """
+    Pulls complete JSON objects out of streamed model output as they close.
+
+    Only brace depth and string state are tracked, so code fences, prose and
+    the surrounding array brackets are skipped without buffering the whole reply.
+    """
+
+    def __init__(self):
+        self._buffer: list[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text: str) -> list[dict]:
+        objects = []
+        for char in text:
+            if self._depth == 0:
+                if char == "{":
+                    self._buffer = [char]
+                    self._depth = 1
+                continue
+            self._buffer.append(char)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        obj = json.loads("".join(self._buffer))
+                    except ValueError:
+                        continue
+                    if isinstance(obj, dict):
+                        objects.append(obj)
+        return objects
+
+
+def _clean_ingredient(obj: dict) -> dict | None:
+    """Keep the fields a grocery item uses; None for objects that aren't ingredients."""
+    name = obj.get("name")
+    if not isinstance(name, str) or not name.strip():
+        return None
+    ingredient = {"name": name.strip(), "quantity": str(obj.get("quantity") or "")}
+    if isinstance(obj.get("category"), str) and obj["category"] in CATEGORY_KEYWORDS:
+        ingredient["category"] = obj["category"]
+    return ingredient
 
 
 class GroceryService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def list_all(self, status: str | None = None) -> list[GroceryList]:
-        query = select(GroceryList).order_by(GroceryList.week_of.desc())
+    async def list_all(
+        self,
+        status: str | None = None,
+        limit: int | None = None,
+        before: int | None = None,
+        with_items: bool = False,
+    ) -> list[GroceryList]:
+        """
+        Without limit/before: every list, newest week first. Paged: newest created
+        first, keyset-based on (created_at, id) -- pass the id of the last list of
+        the previous page as `before`. with_items loads every list's items in one
+        extra query.
+        """
+        if limit or before:
+            query = select(GroceryList).order_by(GroceryList.created_at.desc(), GroceryList.id.desc())
+        else:
+            query = select(GroceryList).order_by(GroceryList.week_of.desc())
         if status:
             query = query.where(GroceryList.status == status)
+        if before:
+            cursor_created_at = select(GroceryList.created_at).where(GroceryList.id == before).scalar_subquery()
+            query = query.where(tuple_(GroceryList.created_at, GroceryList.id) < tuple_(cursor_created_at, before))
+        if limit:
+            query = query.limit(limit)
+        if with_items:
+            query = query.options(selectinload(GroceryList.items))
         result = await self.db.execute(query)
         return list(result.scalars().all())
 
-    async def get(self, list_id: int) -> GroceryList:
-        grocery_list = await self.db.get(GroceryList, list_id)
+    async def get(self, list_id: int, with_items: bool = False) -> GroceryList:
+        options = [selectinload(GroceryList.items)] if with_items else []
+        grocery_list = await self.db.get(GroceryList, list_id, options=options)
         if not grocery_list:
             raise HTTPException(status_code=404, detail="Grocery list not found")
+        if with_items and "items" in inspect(grocery_list).unloaded:
+            # Already in the identity map without its items
+            await self.db.refresh(grocery_list, ["items"])
         return grocery_list
 
     async def get_items(self, list_id: int) -> list[GroceryItem]:
@@ -206,15 +517,20 @@ class GroceryService:
         )
         return list(result.scalars().all())
 
-    async def create_list(self, week_of: date, name: str | None = None) -> GroceryList:
+    def _new_list(self, week_of: date, name: str | None = None) -> GroceryList:
         grocery_list = GroceryList(
             week_of=week_of,
             name=name or f"Week of {week_of.strftime('%b %d')}",
             status="active",
         )
         self.db.add(grocery_list)
+        return grocery_list
+
+    async def create_list(self, week_of: date, name: str | None = None) -> GroceryList:
+        grocery_list = self._new_list(week_of, name)
         await self.db.commit()
-        await self.db.refresh(grocery_list)
+        await self.db.refresh(grocery_list, ["created_at", "items"])
+        publish("grocery", "list_created", {"list_id": grocery_list.id, "week_of": str(week_of)})
         return grocery_list
 
     async def add_item(self, list_id: int, data: GroceryItemCreate) -> GroceryItem:
@@ -235,14 +551,51 @@ class GroceryService:
         self.db.add(item)
         await self.db.commit()
         await self.db.refresh(item)
+        publish(f"grocery:{list_id}", "item_added", _item_event(item))
         return item
 
+    async def _insert_items(self, rows: list[dict]) -> list[GroceryItem]:
+        """Insert many items in one INSERT ... RETURNING round trip (caller commits)."""
+        if not rows:
+            return []
+        result = await self.db.scalars(
+            insert(GroceryItem).returning(GroceryItem, sort_by_parameter_order=True),
+            rows,
+        )
+        return list(result.all())
+
+    async def add_items(self, list_id: int, data: GroceryBulkAdd) -> list[GroceryItem]:
+        """Add typed items and/or one item per line of pasted text, skipping repeats."""
+        await self.get(list_id)
+
+        entries = list(data.items) + [
+            GroceryItemCreate(item_name=name, is_manual=True) for name in _pasted_item_names(data.text or "")
+        ]
+        rows, seen = [], set()
+        for entry in entries:
+            key = normalize_item_name(entry.item_name)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            category = entry.category if entry.category != "Pantry" else _categorize_item(entry.item_name)
+            rows.append(_item_row(
+                list_id, entry.item_name.strip(), category, entry.quantity,
+                is_manual=entry.is_manual, notes=entry.notes,
+            ))
+
+        items = await self._insert_items(rows)
+        await self.db.commit()
+        if items:
+            publish(f"grocery:{list_id}", "items_added", {"list_id": list_id, "items": [_item_event(i) for i in items]})
+        return items
+
     async def update_item(self, item_id: int, data: GroceryItemUpdate, user: User | None = None) -> GroceryItem:
         item = await self.db.get(GroceryItem, item_id)
         if not item:
             raise HTTPException(status_code=404, detail="Grocery item not found")
 
         update_data = data.model_dump(exclude_unset=True)
+        purchased_now = bool(update_data.get("is_purchased")) and not item.is_purchased
 
         if "is_purchased" in update_data and update_data["is_purchased"]:
             item.purchased_at = datetime.now(timezone.utc)
@@ -258,6 +611,7 @@ class GroceryService:
 
         await self.db.commit()
         await self.db.refresh(item)
+        publish(f"grocery:{item.list_id}", "item_purchased" if purchased_now else "item_updated", _item_event(item))
         return item
 
     async def delete_item(self, item_id: int) -> dict:
@@ -266,6 +620,7 @@ class GroceryService:
             raise HTTPException(status_code=404, detail="Grocery item not found")
         await self.db.delete(item)
         await self.db.commit()
+        publish(f"grocery:{item.list_id}", "item_deleted", {"id": item_id})
         return {"ok": True}
 
     async def update_list_status(self, list_id: int, status: str) -> GroceryList:
@@ -273,69 +628,301 @@ class GroceryService:
         grocery_list.status = status
         await self.db.commit()
         await self.db.refresh(grocery_list)
+        publish(f"grocery:{list_id}", "list_status", {"list_id": list_id, "status": status})
         return grocery_list
 
-    async def generate_from_meals(self, week_of: date, user: User, list_name: str | None = None) -> GroceryList:
-        """Generate a grocery list from the week's meal plans."""
+    async def generate_from_meals(
+        self,
+        week_of: date,
+        user: User,
+        list_name: str | None = None,
+        incremental: bool = False,
+        list_id: int | None = None,
+    ) -> GroceryList:
+        """
+        Generate a grocery list from the week's meal plans. With incremental, update
+        the list previously generated for the week (or list_id) in place instead.
+        """
         # Get all meals for the week
         end_date = week_of + timedelta(days=6)
         result = await self.db.execute(
             select(MealPlan).where(
                 and_(MealPlan.plan_date >= week_of, MealPlan.plan_date <= end_date)
-            )
+            ).order_by(MealPlan.plan_date, MealPlan.id)
         )
         meals = list(result.scalars().all())
 
         if not meals:
             raise HTTPException(status_code=400, detail="No meals planned for this week")
 
-        # Create the grocery list
-        grocery_list = await self.create_list(week_of, list_name)
+        grocery_list = await self._generated_list(week_of, list_id) if incremental else None
+        previous = grocery_list.meal_snapshot if grocery_list else None
+        if isinstance(previous, list):
+            # Snapshots written before per-item state was recorded
+            previous = grocery_list.meal_snapshot = {"meals": previous, "items": {}}
+        resolved = await self._resolve_meals(meals, previous["meals"] if previous else None)
+
+        # Sum every meal's ingredients by name, converting compatible units
+        totals: dict[str, tuple[dict, QuantityTotal]] = {}
+        for meal in resolved:
+            for ing in meal["ingredients"]:
+                key = ingredient_key(ing["name"])
+                if key not in totals:
+                    totals[key] = (ing, QuantityTotal())
+                totals[key][1].add(ing.get("quantity"), ing.get("unit"), ing.get("servings_scale", 1.0))
+
+        notes = await self._subtract_pantry(totals, week_of)
+
+        generated = {key: {"quantity": str(total)[:50] or None, "notes": notes.get(key)} for key, (_, total) in totals.items()}
+        snapshot = {"meals": resolved, "items": generated}
+        if grocery_list is not None:
+            return await self._reconcile(grocery_list, totals, generated, snapshot)
+
+        # Create the list and all its items in one transaction
+        grocery_list = self._new_list(week_of, list_name)
+        grocery_list.meal_snapshot = snapshot
+        await self.db.flush()
+        await self._insert_items([
+            _item_row(grocery_list.id, ing["name"], ing.get("category") or _categorize_item(ing["name"]),
+                      generated[key]["quantity"], notes=generated[key]["notes"])
+            for key, (ing, total) in totals.items()
+        ])
+        await self.db.commit()
+        await self.db.refresh(grocery_list, ["created_at", "items"])
+        publish("grocery", "list_created", {"list_id": grocery_list.id, "week_of": str(week_of)})
+        publish(f"grocery:{grocery_list.id}", "list_generated", {"list_id": grocery_list.id, "items": len(totals)})
+        return grocery_list
 
-        # Collect all ingredients, deduplicating
-        ingredients_map: dict[str, dict] = {}
+    async def _generated_list(self, week_of: date, list_id: int | None) -> GroceryList | None:
+        """The list to regenerate: list_id, else the newest list generated for the week (None if there isn't one)."""
+        if list_id is not None:
+            grocery_list = await self.get(list_id, with_items=True)
+            if grocery_list.meal_snapshot is None:
+                raise HTTPException(status_code=400, detail="Grocery list was not generated from meals")
+            if grocery_list.week_of != week_of:
+                raise HTTPException(status_code=400, detail=f"Grocery list is for the week of {grocery_list.week_of}")
+            return grocery_list
+        result = await self.db.execute(
+            select(GroceryList)
+            .where(GroceryList.week_of == week_of, GroceryList.meal_snapshot.is_not(None))
+            .order_by(GroceryList.created_at.desc(), GroceryList.id.desc())
+            .limit(1)
+            .options(selectinload(GroceryList.items))
+        )
+        return result.scalars().first()
+
+    async def _resolve_meals(self, meals: list[MealPlan], previous: list[dict] | None) -> list[dict]:
+        """
+        Each meal's ingredients, as stored in GroceryList.meal_snapshot["meals"]. Recipes and
+        built-ins are matched afresh (cheap); meals Ollama answered for the previous
+        snapshot reuse that answer, so only new unmatched meals reach the model.
+        """
+        recipes_by_id, recipe_index = await self._recipe_index()
+        inferred = {
+            normalize_item_name(entry["name"]): entry["ingredients"]
+            for entry in previous or [] if entry.get("source") == "ollama" and entry.get("ingredients")
+        }
+
+        snapshot: list[dict] = []
         unmatched_meals: list[str] = []
-
         for meal in meals:
-            matched = _match_meal(meal.meal_name)
-            if matched:
-                for ing in matched:
-                    key = ing["name"].lower()
-                    if key not in ingredients_map:
-                        ingredients_map[key] = ing
+            entry = {"meal_id": meal.id, "date": meal.plan_date.isoformat(), "name": meal.meal_name,
+                     "recipe_id": meal.recipe_id}
+            if meal.recipe_id in recipes_by_id:
+                entry.update(source="recipe", ingredients=recipes_by_id[meal.recipe_id])
+            elif matched := _match_meal(meal.meal_name, recipe_index):
+                entry.update(source="matched", ingredients=matched)
+            elif normalize_item_name(meal.meal_name) in inferred:
+                entry.update(source="ollama", ingredients=inferred[normalize_item_name(meal.meal_name)])
             else:
+                entry.update(source="ollama", ingredients=None)
                 unmatched_meals.append(meal.meal_name)
+            snapshot.append(entry)
 
         # For unmatched meals, try Ollama for ingredient suggestions
         if unmatched_meals:
-            ollama_ingredients = await self._get_ingredients_from_ollama(unmatched_meals)
-            for ing in ollama_ingredients:
-                key = ing["name"].lower()
-                if key not in ingredients_map:
-                    ingredients_map[key] = ing
-
-        # Add all ingredients to the list
-        for ing in ingredients_map.values():
-            category = ing.get("category") or _categorize_item(ing["name"])
-            item = GroceryItem(
-                list_id=grocery_list.id,
-                item_name=ing["name"],
-                category=category,
-                quantity=ing.get("quantity", ""),
-                sprouts_url=_sprouts_url(ing["name"]),
-                wholefoods_url=_wholefoods_url(ing["name"]),
-            )
-            self.db.add(item)
-
+            suggestions = await self._get_ingredients_from_ollama(unmatched_meals)
+            for entry in snapshot:
+                if entry["ingredients"] is None:
+                    entry["ingredients"] = suggestions.get(normalize_item_name(entry["name"]), [])
+        return snapshot
+
+    async def _reconcile(
+        self,
+        grocery_list: GroceryList,
+        totals: dict[str, tuple[dict, QuantityTotal]],
+        generated: dict[str, dict],
+        snapshot: dict,
+    ) -> GroceryList:
+        """
+        Bring a generated list in line with new totals: add new ingredients, update
+        changed quantities and drop ones no meal needs any more.
+
+        Only items still as the last generation left them are changed. Manual,
+        purchased and hand-edited items (quantity or notes) are kept as they are,
+        and a generated item deleted by hand is only re-added if the amount the
+        meals need has changed since. Duplicate items for one ingredient (e.g.
+        "Carrot" and "carrots" from older lists) are collapsed: the first
+        untouched one is updated and the other untouched ones deleted. Nothing
+        is changed for an ingredient that has a purchased item.
+        """
+        before = grocery_list.meal_snapshot.get("items", {})
+        existing: dict[str, list[GroceryItem]] = defaultdict(list)
+        for item in sorted(grocery_list.items, key=lambda i: i.id):
+            existing[ingredient_key(item.item_name)].append(item)
+
+        def untouched(key: str, item: GroceryItem) -> bool:
+            if item.is_manual or item.is_purchased:
+                return False
+            last = before.get(key)
+            return last is None or (item.quantity, item.notes) == (last["quantity"], last["notes"])
+
+        new_rows, updated, removed = [], 0, 0
+        for key, (ing, _) in totals.items():
+            target = generated[key]
+            items = existing.get(key, [])
+            if not items:
+                if before.get(key) != target:
+                    category = ing.get("category") or _categorize_item(ing["name"])
+                    new_rows.append(_item_row(grocery_list.id, ing["name"], category, target["quantity"],
+                                              notes=target["notes"]))
+                continue
+            if any(item.is_purchased for item in items):
+                # Already bought this week; don't put it back on the list
+                continue
+            editable = [item for item in items if untouched(key, item)]
+            if not editable:
+                continue
+            first, *duplicates = editable
+            if (first.quantity, first.notes) != (target["quantity"], target["notes"]):
+                first.quantity, first.notes = target["quantity"], target["notes"]
+                updated += 1
+            for item in duplicates:
+                await self.db.delete(item)
+                removed += 1
+        for key, items in existing.items():
+            if key not in totals:
+                for item in items:
+                    if untouched(key, item):
+                        await self.db.delete(item)
+                        removed += 1
+
+        await self._insert_items(new_rows)
+        grocery_list.meal_snapshot = snapshot
         await self.db.commit()
-        await self.db.refresh(grocery_list)
+        await self.db.refresh(grocery_list, ["items"])
+        logger.info(f"Regenerated grocery list {grocery_list.id}: +{len(new_rows)} ~{updated} -{removed}")
+        publish(f"grocery:{grocery_list.id}", "list_regenerated", {
+            "list_id": grocery_list.id, "added": len(new_rows), "updated": updated, "removed": removed,
+        })
         return grocery_list
 
-    async def _get_ingredients_from_ollama(self, meal_names: list[str]) -> list[dict]:
-        """Use local Ollama to suggest ingredients for unmatched meals."""
-        try:
-            meals_text = ", ".join(meal_names)
-            prompt = f"""For these meals: {meals_text}
+    async def _subtract_pantry(self, totals: dict[str, tuple[dict, QuantityTotal]], week_of: date) -> dict[str, str]:
+        """
+        Take unconsumed pantry stock off the week's totals, matched by ingredient_key.
+        Ingredients fully covered by stock that keeps past the week are removed from
+        `totals`. One covered only thanks to stock expiring this week stays, with no
+        quantity left, so the note reminds us to use it. Returns a note per remaining
+        ingredient that has stock on hand (partial, unmeasured, expiring or expired).
+        """
+        pantry: dict[str, list[PantryItem]] = defaultdict(list)
+        for item in await PantryService(self.db).list_all():  # soonest expiry first
+            pantry[ingredient_key(item.item_name)].append(item)
+
+        today = date.today()
+        week_end = week_of + timedelta(days=6)
+        notes: dict[str, str] = {}
+        for key in [k for k in totals if k in pantry]:
+            total = totals[key][1]
+            remarks = []
+            expired = [i for i in pantry[key] if i.expiration_date and i.expiration_date < today]
+            expiring = [i for i in pantry[key] if i.expiration_date and today <= i.expiration_date <= week_end]
+            keeping = [i for i in pantry[key] if i not in expired and i not in expiring]
+
+            for item in keeping:
+                if total.subtract(item.quantity, item.unit):
+                    remarks.append(f"{_on_hand(item)} on hand{_where(item)}")
+                else:
+                    remarks.append(f"{_on_hand(item)} in pantry{_where(item)}")
+            if total.covered:
+                del totals[key]
+                continue
+
+            for item in expiring:
+                verb = "using" if total.subtract(item.quantity, item.unit) else "have"
+                remarks.append(f"{verb} {_on_hand(item)} from pantry{_where(item)}, expires {item.expiration_date:%b %d}")
+            for item in expired:
+                remarks.append(f"pantry stock expired {item.expiration_date:%b %d}")
+            if remarks:
+                notes[key] = "; ".join(remarks)
+        return notes
+
+    async def _recipe_index(self) -> tuple[dict[int, list[dict]], MealIndex]:
+        """
+        Saved recipes' ingredients by id, plus a name index over them (one query).
+        Each ingredient carries a servings_scale from the recipe's yield to the household size.
+        """
+        result = await self.db.execute(
+            select(Recipe.id, Recipe.name, Recipe.ingredients, Recipe.servings)
+            .order_by(Recipe.is_favorite.desc(), Recipe.id)
+        )
+        by_id: dict[int, list[dict]] = {}
+        index = MealIndex()
+        for recipe_id, name, ingredients, servings in result.all():
+            scale = settings.household_servings / servings if servings else 1.0
+            ingredients = [
+                {**i, "servings_scale": scale}
+                for i in ingredients or [] if isinstance(i, dict) and i.get("name")
+            ]
+            if ingredients:
+                by_id[recipe_id] = ingredients
+                index.add(name, ingredients)
+        return by_id, index
+
+    async def _get_ingredients_from_ollama(self, meal_names: list[str]) -> dict[str, list[dict]]:
+        """
+        Ingredients for meals no recipe covers, by normalized meal name. Answers are cached per (meal, model),
+        so only meals never seen before go to Ollama: one request each, a few at a time.
+        """
+        model = settings.ollama_grocery_model
+        meals = {normalize_item_name(name): name for name in meal_names}
+        meals.pop("", None)
+        if not meals:
+            return {}
+
+        result = await self.db.execute(
+            select(MealIngredientCache.meal_key, MealIngredientCache.ingredients).where(
+                MealIngredientCache.model == model,
+                MealIngredientCache.meal_key.in_(meals),
+            )
+        )
+        known = dict(result.all())
+        missing = [key for key in meals if key not in known]
+
+        if missing:
+            limit = asyncio.Semaphore(max(1, settings.ollama_max_concurrency))
+            answers = await asyncio.gather(*(self._ask_ollama(meals[key], model, limit) for key in missing))
+            fresh = [
+                {"meal_key": key, "model": model, "ingredients": ingredients}
+                for key, (ingredients, complete) in zip(missing, answers) if ingredients and complete
+            ]
+            if fresh:
+                stmt = pg_insert(MealIngredientCache).values(fresh)
+                await self.db.execute(stmt.on_conflict_do_update(
+                    constraint="uq_meal_ingredient_cache_meal_model",
+                    set_={"ingredients": stmt.excluded.ingredients, "created_at": func.now()},
+                ))
+            known.update((key, ingredients) for key, (ingredients, _) in zip(missing, answers))
+            logger.info(f"Ollama ingredients: {len(meals) - len(missing)} cached, {len(fresh)}/{len(missing)} inferred")
+
+        return known
+
+    async def _ask_ollama(self, meal_name: str, model: str, limit: asyncio.Semaphore) -> tuple[list[dict], bool]:
+        """
+        Stream one meal's ingredient list from Ollama, keeping each object as soon as it
+        is complete. Returns (ingredients, complete); a cut-off answer is still usable.
+        """
+        prompt = f"""For this meal: {meal_name}
 
 List the grocery ingredients needed. Return ONLY a JSON array like:
 [{{"name": "chicken breast", "quantity": "2 lbs", "category": "Meat & Seafood"}}]
@@ -344,34 +931,31 @@ Categories: Produce, Meat & Seafood, Dairy & Eggs, Bakery & Bread, Pantry, Spice
 Only include items that need to be purchased, not basic pantry staples like salt/pepper/oil.
 Return ONLY the JSON array."""
 
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                resp = await client.post(
+        parser = JsonObjectStream()
+        ingredients: list[dict] = []
+        async with limit:
+            try:
+                async with http_clients.get("ollama").stream(
+                    "POST",
                     f"{settings.ollama_base_url}/api/generate",
                     json={
-                        "model": "llama3.3:70b",
+                        "model": model,
                         "prompt": prompt,
-                        "stream": False,
+                        "stream": True,
                         "options": {"temperature": 0.3},
                     },
-                )
-                resp.raise_for_status()
-                data = resp.json()
-
-            response_text = data.get("response", "")
-            # Extract JSON
-            if "```" in response_text:
-                response_text = response_text.split("```")[1]
-                if response_text.startswith("json"):
-                    response_text = response_text[4:]
-                response_text = response_text.strip()
-
-            # Find the JSON array
-            start = response_text.find("[")
-            end = response_text.rfind("]") + 1
-            if start >= 0 and end > start:
-                return json.loads(response_text[start:end])
-
-        except Exception as e:
-            logger.warning(f"Ollama ingredient suggestion failed: {e}")
-
-        return []
+                ) as resp:
+                    resp.raise_for_status()
+                    async for line in resp.aiter_lines():
+                        if not line:
+                            continue
+                        chunk = json.loads(line)
+                        for obj in parser.feed(chunk.get("response", "")):
+                            if ingredient := _clean_ingredient(obj):
+                                ingredients.append(ingredient)
+                        if chunk.get("done"):
+                            break
+            except Exception as e:
+                logger.warning(f"Ollama ingredient suggestion for {meal_name!r} failed: {e}")
+                return ingredients, False
+        return ingredients, True
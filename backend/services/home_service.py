@@ -10,6 +10,7 @@ from backend.schemas.home import (
     MaintenanceTaskCreate, MaintenanceTaskUpdate,
     MaintenanceLogCreate,
 )
+from backend.services.dashboard_cache import invalidate_dashboard
 
 FREQUENCY_DAYS = {
     "monthly": 30,
@@ -58,6 +59,7 @@ class HomeService:
         appliance = await self.get_appliance(appliance_id)
         await self.db.delete(appliance)
         await self.db.commit()
+        invalidate_dashboard("maintenance_due")
         return {"ok": True}
 
     # ── Maintenance Tasks ────────────────────────────────────
@@ -91,6 +93,7 @@ class HomeService:
         )
         self.db.add(task)
         await self.db.commit()
+        invalidate_dashboard("maintenance_due")
         await self.db.refresh(task)
         return task
 
@@ -105,6 +108,7 @@ class HomeService:
             setattr(task, key, value)
 
         await self.db.commit()
+        invalidate_dashboard("maintenance_due")
         await self.db.refresh(task)
         return task
 
@@ -112,6 +116,7 @@ class HomeService:
         task = await self.get_task(task_id)
         await self.db.delete(task)
         await self.db.commit()
+        invalidate_dashboard("maintenance_due")
         return {"ok": True}
 
     async def complete_task(self, task_id: int, notes: str | None = None, cost: float | None = None) -> dict:
@@ -136,6 +141,7 @@ class HomeService:
             task.next_due = None
 
         await self.db.commit()
+        invalidate_dashboard("maintenance_due")
         await self.db.refresh(task)
 
         return {
@@ -0,0 +1,184 @@
+"""
+Pluggable LLM backends for the chat tool loop.
+
+A backend takes an encoded Messages API request body and yields Anthropic
+streaming events (message_start, content_block_*, message_delta, ...).
+AnthropicBackend talks to the API; ReplayBackend replays recorded responses
+locally so the chat hot path can be exercised and benchmarked offline, and
+RecordingBackend captures those recordings from live traffic.
+"""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Protocol
+
+from backend.http_clients import ANTHROPIC_MESSAGES_URL, anthropic_headers, http_clients
+
+USAGE_FIELDS = ("input_tokens", "cache_creation_input_tokens", "cache_read_input_tokens", "output_tokens")
+
+
+class LLMBackend(Protocol):
+    def stream(self, body: bytes) -> AsyncIterator[dict]: ...
+
+
+class MessageAssembler:
+    """Rebuilds one response (content blocks, stop reason, usage) from its stream events."""
+
+    def __init__(self):
+        self.content: list[dict] = []
+        self.stop_reason = "end_turn"
+        self.usage = dict.fromkeys(USAGE_FIELDS, 0)
+        self._partial_json: dict[int, list[str]] = {}
+
+    def feed(self, event: dict) -> str | None:
+        """Apply one event; returns the text delta it carried, if any."""
+        kind = event.get("type")
+        if kind == "message_start":
+            self._add_usage(event["message"].get("usage", {}))
+        elif kind == "content_block_start":
+            block = dict(event["content_block"])
+            self.content.append(block)
+            if block["type"] == "tool_use":
+                self._partial_json[event["index"]] = []
+        elif kind == "content_block_delta":
+            delta = event["delta"]
+            if delta["type"] == "text_delta":
+                self.content[event["index"]]["text"] += delta["text"]
+                return delta["text"]
+            if delta["type"] == "input_json_delta":
+                self._partial_json[event["index"]].append(delta["partial_json"])
+        elif kind == "content_block_stop":
+            if event["index"] in self._partial_json:
+                raw = "".join(self._partial_json.pop(event["index"]))
+                self.content[event["index"]]["input"] = json.loads(raw) if raw else {}
+        elif kind == "message_delta":
+            self.stop_reason = event["delta"].get("stop_reason") or self.stop_reason
+            self._add_usage(event.get("usage", {}))
+        elif kind == "error":
+            raise RuntimeError(event.get("error", {}).get("message", "Anthropic stream error"))
+        return None
+
+    def _add_usage(self, usage: dict):
+        self.usage.update({k: v for k, v in usage.items() if k in self.usage and v})
+
+    def result(self) -> dict:
+        return {"content": self.content, "stop_reason": self.stop_reason, "usage": self.usage}
+
+
+class AnthropicBackend:
+    """Streams from the Messages API over the shared pooled client."""
+
+    async def stream(self, body: bytes) -> AsyncIterator[dict]:
+        async with http_clients.get("anthropic").stream(
+            "POST",
+            ANTHROPIC_MESSAGES_URL,
+            headers=anthropic_headers(),
+            content=body,
+        ) as resp:
+            resp.raise_for_status()
+            async for line in resp.aiter_lines():
+                if line.startswith("data:"):
+                    yield json.loads(line[5:])
+
+
+def response_events(response: dict, chunk_chars: int = 24) -> list[dict]:
+    """Stream events equivalent to one recorded response ({content, stop_reason, usage})."""
+    usage = response.get("usage", {})
+    events = [{
+        "type": "message_start",
+        "message": {"usage": {k: v for k, v in usage.items() if k != "output_tokens"}},
+    }]
+    for index, block in enumerate(response["content"]):
+        if block["type"] == "text":
+            events.append({"type": "content_block_start", "index": index, "content_block": {"type": "text", "text": ""}})
+            text = block["text"]
+            for i in range(0, len(text), chunk_chars):
+                events.append({
+                    "type": "content_block_delta",
+                    "index": index,
+                    "delta": {"type": "text_delta", "text": text[i:i + chunk_chars]},
+                })
+        else:
+            events.append({
+                "type": "content_block_start",
+                "index": index,
+                "content_block": {**block, "input": {}} if block["type"] == "tool_use" else block,
+            })
+            if block["type"] == "tool_use":
+                events.append({
+                    "type": "content_block_delta",
+                    "index": index,
+                    "delta": {"type": "input_json_delta", "partial_json": json.dumps(block.get("input", {}))},
+                })
+        events.append({"type": "content_block_stop", "index": index})
+    events.append({
+        "type": "message_delta",
+        "delta": {"stop_reason": response.get("stop_reason", "end_turn")},
+        "usage": {"output_tokens": usage.get("output_tokens", 0)},
+    })
+    events.append({"type": "message_stop"})
+    return events
+
+
+class ReplayBackend:
+    """
+    Replays a recorded transcript: the Nth call returns the Nth recorded response.
+
+    A transcript is {"message": str, "responses": [{content, stop_reason, usage}, ...]}.
+    latency simulates model time to first token per call, in seconds.
+    """
+
+    def __init__(self, responses: list[dict], latency: float = 0.0):
+        self.responses = responses
+        self.latency = latency
+        self.calls = 0
+
+    @classmethod
+    def from_file(cls, path: str | Path, latency: float = 0.0) -> "ReplayBackend":
+        return cls(json.loads(Path(path).read_text())["responses"], latency=latency)
+
+    def reset(self):
+        self.calls = 0
+
+    async def stream(self, body: bytes) -> AsyncIterator[dict]:
+        if self.calls >= len(self.responses):
+            raise RuntimeError(f"Replay transcript exhausted after {self.calls} responses")
+        response = self.responses[self.calls]
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        for event in response_events(response):
+            yield event
+
+
+class RecordingBackend:
+    """Passes another backend through while keeping each assembled response for replay."""
+
+    def __init__(self, inner: LLMBackend):
+        self.inner = inner
+        self.responses: list[dict] = []
+
+    async def stream(self, body: bytes) -> AsyncIterator[dict]:
+        assembler = MessageAssembler()
+        async for event in self.inner.stream(body):
+            assembler.feed(event)
+            yield event
+        self.responses.append(assembler.result())
+
+    def save(self, path: str | Path, message: str):
+        Path(path).write_text(json.dumps({"message": message, "responses": self.responses}, indent=2))
+
+
+_backend: LLMBackend = AnthropicBackend()
+
+
+def get_llm_backend() -> LLMBackend:
+    return _backend
+
+
+def set_llm_backend(backend: LLMBackend):
+    """Swap the backend used by new ChatService instances (replay/benchmarks)."""
+    global _backend
+    _backend = backend
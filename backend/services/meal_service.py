@@ -8,13 +8,26 @@ from sqlalchemy.ext.asyncio import AsyncSession
 import httpx
 
 from backend.config import settings
+from backend.http_clients import ANTHROPIC_MESSAGES_URL, anthropic_headers, http_clients
 from backend.models.meal import MealPlan
 from backend.models.user import User
 from backend.schemas.meal import MealPlanCreate, MealPlanUpdate
+from backend.services.dashboard_cache import invalidate_dashboard
+from backend.services.event_hub import publish
 
 logger = logging.getLogger(__name__)
 
 
+def _meal_event(action: str, meal: MealPlan) -> dict:
+    return {
+        "action": action,
+        "id": meal.id,
+        "plan_date": str(meal.plan_date),
+        "meal_type": meal.meal_type,
+        "meal_name": meal.meal_name,
+    }
+
+
 class MealService:
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -59,7 +72,9 @@ class MealService:
         )
         self.db.add(meal)
         await self.db.commit()
+        invalidate_dashboard("todays_meals")
         await self.db.refresh(meal)
+        publish("meals", "meal_changed", _meal_event("created", meal))
         return meal
 
     async def update(self, meal_id: int, data: MealPlanUpdate) -> MealPlan:
@@ -72,7 +87,9 @@ class MealService:
             setattr(meal, key, value)
 
         await self.db.commit()
+        invalidate_dashboard("todays_meals")
         await self.db.refresh(meal)
+        publish("meals", "meal_changed", _meal_event("updated", meal))
         return meal
 
     async def delete(self, meal_id: int) -> dict:
@@ -81,6 +98,8 @@ class MealService:
             raise HTTPException(status_code=404, detail="Meal plan entry not found")
         await self.db.delete(meal)
         await self.db.commit()
+        invalidate_dashboard("todays_meals")
+        publish("meals", "meal_changed", _meal_event("deleted", meal))
         return {"ok": True}
 
     async def generate_with_ai(
@@ -117,24 +136,20 @@ Guidelines:
 - Return ONLY the JSON array, no other text"""
 
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                resp = await client.post(
-                    "https://api.anthropic.com/v1/messages",
-                    headers={
-                        "x-api-key": settings.anthropic_api_key,
-                        "anthropic-version": "2023-06-01",
-                        "content-type": "application/json",
-                    },
-                    json={
-                        "model": "claude-sonnet-4-20250514",
-                        "max_tokens": 4096,
-                        "messages": [
-                            {"role": "user", "content": prompt}
-                        ],
-                    },
-                )
-                resp.raise_for_status()
-                data = resp.json()
+            resp = await http_clients.get("anthropic").post(
+                ANTHROPIC_MESSAGES_URL,
+                headers=anthropic_headers(),
+                json={
+                    "model": "claude-sonnet-4-20250514",
+                    "max_tokens": 4096,
+                    "messages": [
+                        {"role": "user", "content": prompt}
+                    ],
+                },
+                timeout=60.0,
+            )
+            resp.raise_for_status()
+            data = resp.json()
 
             # Parse the response
             content = data["content"][0]["text"]
@@ -173,8 +188,10 @@ Guidelines:
                 created.append(meal)
 
             await self.db.commit()
+            invalidate_dashboard("todays_meals")
             for meal in created:
                 await self.db.refresh(meal)
+            publish("meals", "meals_generated", {"start_date": str(start_date), "count": len(created)})
 
             return created
 
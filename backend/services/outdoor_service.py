@@ -9,6 +9,8 @@ from sqlalchemy.dialects.postgresql import insert as pg_insert
 from backend.models.outdoor import OutdoorSession, SavedOption
 from backend.models.user import User
 from backend.schemas.outdoor import OutdoorSessionCreate, OutdoorSessionUpdate
+from backend.services.dashboard_cache import invalidate_dashboard
+from backend.services.weather_service import forecast_store
 
 logger = logging.getLogger(__name__)
 
@@ -80,6 +82,12 @@ class OutdoorService:
     async def create(self, data: OutdoorSessionCreate, user: User) -> OutdoorSession:
         duration = _calc_duration(data.start_time, data.end_time)
 
+        # Fill in conditions from the prefetched hourly forecast when not given
+        weather = data.weather
+        if not weather:
+            started = datetime.combine(data.session_date, datetime.strptime(data.start_time, "%H:%M").time())
+            weather = forecast_store.describe_at(started)
+
         session = OutdoorSession(
             session_date=data.session_date,
             start_time=data.start_time,
@@ -87,7 +95,7 @@ class OutdoorService:
             duration_minutes=duration,
             location=data.location,
             activity=data.activity,
-            weather=data.weather,
+            weather=weather,
             notes=data.notes,
             source=data.source,
             created_by=user.username,
@@ -97,9 +105,10 @@ class OutdoorService:
         # Save options for smart dropdowns
         await self._save_option("location", data.location)
         await self._save_option("activity", data.activity)
-        await self._save_option("weather", data.weather)
+        await self._save_option("weather", weather)
 
         await self.db.commit()
+        invalidate_dashboard("outdoor_this_week")
         await self.db.refresh(session)
         return session
 
@@ -123,6 +132,7 @@ class OutdoorService:
             await self._save_option("weather", session.weather)
 
         await self.db.commit()
+        invalidate_dashboard("outdoor_this_week")
         await self.db.refresh(session)
         return session
 
@@ -130,6 +140,7 @@ class OutdoorService:
         session = await self.get(session_id)
         await self.db.delete(session)
         await self.db.commit()
+        invalidate_dashboard("outdoor_this_week")
         return {"ok": True}
 
     async def get_options(self, field: str | None = None) -> dict:
@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.models.pantry import PantryItem
 from backend.schemas.pantry import PantryItemCreate, PantryItemUpdate
+from backend.services.dashboard_cache import invalidate_dashboard
 
 
 class PantryService:
@@ -50,6 +51,7 @@ class PantryService:
         )
         self.db.add(item)
         await self.db.commit()
+        invalidate_dashboard("expiring_pantry")
         await self.db.refresh(item)
         return item
 
@@ -59,6 +61,7 @@ class PantryService:
         for key, value in update_data.items():
             setattr(item, key, value)
         await self.db.commit()
+        invalidate_dashboard("expiring_pantry")
         await self.db.refresh(item)
         return item
 
@@ -66,12 +69,14 @@ class PantryService:
         item = await self.get(item_id)
         await self.db.delete(item)
         await self.db.commit()
+        invalidate_dashboard("expiring_pantry")
         return {"ok": True}
 
     async def mark_consumed(self, item_id: int) -> PantryItem:
         item = await self.get(item_id)
         item.is_consumed = True
         await self.db.commit()
+        invalidate_dashboard("expiring_pantry")
         await self.db.refresh(item)
         return item
 
@@ -0,0 +1,199 @@
+"""
+Ingredient quantities: parsing free-text amounts ("1 1/2 cups", "2 lbs",
+"3 cloves"), converting between units of the same kind, and keeping running
+totals that format back into a short quantity string.
+
+Mass and volume convert freely within their kind. Anything else ("cloves",
+"can", a bare number) is a count of that unit and only adds to itself.
+"""
+
+import re
+from dataclasses import dataclass
+
+# Canonical unit -> (kind, size in the kind's base unit: grams or millilitres)
+UNITS: dict[str, tuple[str, float]] = {
+    "g": ("mass", 1.0),
+    "kg": ("mass", 1000.0),
+    "oz": ("mass", 28.349523125),
+    "lb": ("mass", 453.59237),
+    "ml": ("volume", 1.0),
+    "l": ("volume", 1000.0),
+    "tsp": ("volume", 4.92892159375),
+    "tbsp": ("volume", 14.78676478125),
+    "fl oz": ("volume", 29.5735295625),
+    "cup": ("volume", 236.5882365),
+    "pt": ("volume", 473.176473),
+    "qt": ("volume", 946.352946),
+    "gal": ("volume", 3785.411784),
+}
+
+UNIT_ALIASES: dict[str, str] = {
+    "gram": "g", "grams": "g", "gr": "g",
+    "kilogram": "kg", "kilograms": "kg", "kgs": "kg",
+    "ounce": "oz", "ounces": "oz",
+    "lbs": "lb", "pound": "lb", "pounds": "lb",
+    "milliliter": "ml", "milliliters": "ml", "millilitre": "ml", "millilitres": "ml",
+    "liter": "l", "liters": "l", "litre": "l", "litres": "l",
+    "teaspoon": "tsp", "teaspoons": "tsp", "tsps": "tsp",
+    "tablespoon": "tbsp", "tablespoons": "tbsp", "tbsps": "tbsp", "tbs": "tbsp",
+    "fluid ounce": "fl oz", "fluid ounces": "fl oz",
+    "cups": "cup", "c": "cup",
+    "pint": "pt", "pints": "pt",
+    "quart": "qt", "quarts": "qt",
+    "gallon": "gal", "gallons": "gal",
+}
+
+EACH = "each"
+
+_VULGAR_FRACTIONS = {"½": "1/2", "⅓": "1/3", "⅔": "2/3", "¼": "1/4", "¾": "3/4", "⅛": "1/8"}
+_NUMBER = r"\d+\s+\d+/\d+|\d+/\d+|\d*\.\d+|\d+"
+_AMOUNT = re.compile(rf"^(?P<amount>{_NUMBER})(?:\s*(?:-|–|to)\s*(?P<upper>{_NUMBER}))?\s*(?P<unit>.*)$")
+
+
+@dataclass(frozen=True)
+class Quantity:
+    amount: float
+    unit: str  # canonical unit, a singular count unit, or EACH
+
+    @property
+    def kind(self) -> str:
+        return UNITS[self.unit][0] if self.unit in UNITS else self.unit
+
+    @property
+    def base_amount(self) -> float:
+        return self.amount * UNITS[self.unit][1] if self.unit in UNITS else self.amount
+
+
+def _number(text: str) -> float:
+    whole, _, fraction = text.strip().rpartition(" ")
+    if "/" in fraction:
+        numerator, denominator = fraction.split("/")
+        value = int(numerator) / int(denominator) if int(denominator) else 0.0
+        return value + (int(whole) if whole else 0)
+    return float(text)
+
+
+def _singular(unit: str) -> str:
+    if unit.endswith("ies") and len(unit) > 4:
+        return unit[:-3] + "y"
+    if unit.endswith(("ches", "shes", "xes", "sses")):
+        return unit[:-2]
+    if unit.endswith("s") and not unit.endswith("ss") and len(unit) > 2:
+        return unit[:-1]
+    return unit
+
+
+def canonical_unit(unit: str | None) -> str:
+    text = (unit or "").strip().lower().rstrip(".")
+    if not text:
+        return EACH
+    if text in UNITS:
+        return text
+    return UNIT_ALIASES.get(text) or _singular(text)
+
+
+def parse_quantity(quantity: str | None, unit: str | None = None) -> Quantity | None:
+    """
+    Parse "1 1/2", "2-3 lbs", "½ cup" (optionally with a separate unit) into a
+    Quantity; ranges take the upper bound. None when there is no leading number.
+    """
+    text = f"{quantity or ''} {unit or ''}".strip().lower()
+    for symbol, fraction in _VULGAR_FRACTIONS.items():
+        text = text.replace(symbol, f" {fraction}")
+    match = _AMOUNT.match(text.strip())
+    if not match:
+        return None
+    amount = _number(match["upper"] or match["amount"])
+    unit_text = match["unit"].strip()
+    if len(unit_text.split()) > 2:
+        # "2 large ripe avocados": too much prose to call a unit
+        return None
+    return Quantity(amount, canonical_unit(unit_text))
+
+
+def _format_amount(value: float) -> str:
+    whole = int(value)
+    fraction = value - whole
+    if fraction < 0.02:
+        return str(whole)
+    if fraction > 0.98:
+        return str(whole + 1)
+    for denominator in (2, 3, 4, 8):
+        numerator = round(fraction * denominator)
+        if 0 < numerator < denominator and abs(fraction - numerator / denominator) < 0.02:
+            return f"{whole} {numerator}/{denominator}" if whole else f"{numerator}/{denominator}"
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+def _plural(unit: str) -> str:
+    if unit in UNITS and unit != "cup":
+        return unit
+    if unit.endswith("y") and unit[-2:-1] not in "aeiou":
+        return unit[:-1] + "ies"
+    if unit.endswith(("s", "x", "ch", "sh")):
+        return unit + "es"
+    return unit + "s"
+
+
+def format_quantity(quantity: Quantity) -> str:
+    amount = _format_amount(quantity.amount)
+    if quantity.unit == EACH:
+        return amount
+    unit = quantity.unit if quantity.amount <= 1 else _plural(quantity.unit)
+    return f"{amount} {unit}"
+
+
+class QuantityTotal:
+    """
+    Running total of one ingredient's quantities. Amounts of the same kind are
+    summed in base units and shown in the largest unit seen; incompatible kinds
+    and unparseable text ("to taste") are kept side by side.
+    """
+
+    def __init__(self):
+        self._amounts: dict[str, float] = {}  # kind -> base amount
+        self._display: dict[str, str] = {}  # kind -> unit to show it in
+        self._notes: list[str] = []
+
+    def add(self, quantity: str | None, unit: str | None = None, scale: float = 1.0):
+        parsed = parse_quantity(quantity, unit)
+        if parsed is None:
+            text = f"{quantity or ''} {unit or ''}".strip()
+            if text and text not in self._notes:
+                self._notes.append(text)
+            return
+        kind = parsed.kind
+        self._amounts[kind] = self._amounts.get(kind, 0.0) + parsed.base_amount * scale
+        shown = self._display.get(kind)
+        if shown is None or (parsed.unit in UNITS and UNITS[parsed.unit][1] > UNITS[shown][1]):
+            self._display[kind] = parsed.unit
+
+    def subtract(self, quantity: str | None, unit: str | None = None) -> bool:
+        """Take stock on hand off the total; False when it can't be compared (no amount, other kind)."""
+        parsed = parse_quantity(quantity, unit)
+        if parsed is None or parsed.kind not in self._amounts:
+            return False
+        self._amounts[parsed.kind] = max(0.0, self._amounts[parsed.kind] - parsed.base_amount)
+        return True
+
+    @property
+    def covered(self) -> bool:
+        """
+        Every amount has been subtracted away and nothing unparsed is left. A total
+        with no amounts ("salt", "to taste") is never covered: there is nothing to
+        compare stock against.
+        """
+        return bool(self._amounts) and not self._notes and all(amount < 1e-6 for amount in self._amounts.values())
+
+    def quantities(self) -> list[Quantity]:
+        result = []
+        for kind, base in self._amounts.items():
+            unit = self._display[kind]
+            result.append(Quantity(base / UNITS[unit][1] if unit in UNITS else base, unit))
+        return result
+
+    def __bool__(self) -> bool:
+        return bool(self._amounts or self._notes)
+
+    def __str__(self) -> str:
+        return " + ".join([format_quantity(q) for q in self.quantities() if q.amount > 0] + self._notes)
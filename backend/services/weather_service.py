@@ -1,6 +1,15 @@
-import httpx
+import asyncio
+import logging
+import math
+import time
+from array import array
+from datetime import date, datetime, timedelta
+from typing import Callable, Protocol
 
 from backend.config import settings
+from backend.http_clients import http_clients
+
+logger = logging.getLogger(__name__)
 
 WMO_DESCRIPTIONS = {
     0: "Clear sky", 1: "Mainly clear", 2: "Partly cloudy", 3: "Overcast",
@@ -21,35 +30,322 @@ WMO_ICONS = {
 }
 
 
-async def get_weather() -> dict | None:
-    """Fetch current weather from Open-Meteo for Fort Collins, CO."""
-    try:
-        url = (
-            f"https://api.open-meteo.com/v1/forecast"
-            f"?latitude={settings.weather_lat}&longitude={settings.weather_lon}"
-            f"&current=temperature_2m,relative_humidity_2m,apparent_temperature,weather_code,wind_speed_10m"
-            f"&daily=temperature_2m_max,temperature_2m_min"
-            f"&temperature_unit=fahrenheit&wind_speed_unit=mph&timezone=America%2FDenver&forecast_days=1"
+UNIT_PARAMS = {
+    "imperial": {"temperature_unit": "fahrenheit", "wind_speed_unit": "mph"},
+    "metric": {"temperature_unit": "celsius", "wind_speed_unit": "kmh"},
+}
+
+HOURLY_FIELDS = (
+    "temperature_2m", "apparent_temperature", "relative_humidity_2m",
+    "precipitation_probability", "weather_code", "wind_speed_10m",
+)
+DAILY_FIELDS = ("temperature_2m_max", "temperature_2m_min", "precipitation_probability_max", "weather_code")
+
+FORECAST_DAYS = 7
+PAST_DAYS = 1  # keeps yesterday's hours around for back-filling outdoor sessions
+
+WeatherKey = tuple[float, float, str]
+
+
+def _desc(code: int) -> str:
+    return WMO_DESCRIPTIONS.get(code, f"Code {code}")
+
+
+def _icon(code: int) -> str:
+    return WMO_ICONS.get(code, "\U0001f321\ufe0f")
+
+
+class WeatherBackend(Protocol):
+    """Source of raw Open-Meteo-shaped forecast JSON (current + hourly + daily)."""
+
+    async def fetch(self, lat: float, lon: float, units: str) -> dict: ...
+
+
+class OpenMeteoBackend:
+    """Open-Meteo over the app's pooled weather client, so repeat fetches skip the TLS handshake."""
+
+    def __init__(self, base_url: str | None = None):
+        self.base_url = base_url or settings.weather_api_url
+
+    async def fetch(self, lat: float, lon: float, units: str) -> dict:
+        r = await http_clients.get("weather").get(
+            self.base_url,
+            params={
+                "latitude": lat,
+                "longitude": lon,
+                "current": "temperature_2m,relative_humidity_2m,apparent_temperature,weather_code,wind_speed_10m",
+                "hourly": ",".join(HOURLY_FIELDS),
+                "daily": ",".join(DAILY_FIELDS),
+                "timezone": "America/Denver",
+                "forecast_days": FORECAST_DAYS,
+                "past_days": PAST_DAYS,
+                **UNIT_PARAMS[units],
+            },
         )
-        async with httpx.AsyncClient(timeout=8) as client:
-            r = await client.get(url)
-            data = r.json()
+        r.raise_for_status()
+        return r.json()
+
+
+def _parse_current(data: dict, units: str = "imperial") -> dict:
+    """
+    Current conditions in the requested units (temp, feels_like, high, low, wind_speed,
+    tagged with `units`). temp_f / wind_mph are always Fahrenheit / mph for older clients.
+    """
+    cur = data.get("current", {})
+    daily = data.get("daily", {})
+    code = cur.get("weather_code", 0)
+    max_temps = daily.get("temperature_2m_max", [])
+    min_temps = daily.get("temperature_2m_min", [])
+
+    # With past_days the daily series starts before today.
+    days = daily.get("time", [])
+    today = date.today().isoformat()
+    i = days.index(today) if today in days else 0
+
+    temp = cur.get("temperature_2m", 0)
+    wind = cur.get("wind_speed_10m", 0)
+    metric = units == "metric"
+    return {
+        "temp": round(temp),
+        "temp_f": round(temp * 9 / 5 + 32 if metric else temp),
+        "desc": _desc(code),
+        "icon": _icon(code),
+        "humidity": cur.get("relative_humidity_2m", 0),
+        "feels_like": round(cur.get("apparent_temperature", 0)),
+        "wind_speed": round(wind),
+        "wind_mph": round(wind / 1.609344 if metric else wind),
+        "units": units,
+        "high": round(max_temps[i]) if i < len(max_temps) and max_temps[i] is not None else None,
+        "low": round(min_temps[i]) if i < len(min_temps) and min_temps[i] is not None else None,
+    }
+
+
+def _to_array(values: list) -> array:
+    """Pack a JSON series into doubles, NaN for gaps."""
+    return array("d", (math.nan if v is None else float(v) for v in values))
+
+
+def _num(series: array, i: int) -> int | None:
+    v = series[i]
+    return None if math.isnan(v) else round(v)
+
+
+class ForecastStore:
+    """Compact hourly/daily forecast kept as parallel arrays.
+
+    Hourly samples are evenly spaced, so a timestamp maps to an index with one
+    subtraction instead of a search; the store holds ~200 hours in a few KB.
+    """
+
+    def __init__(self):
+        self.units = "imperial"
+        self.updated_at: datetime | None = None
+        self.hourly_start: datetime | None = None
+        self.hourly: dict[str, array] = {}
+        self.daily_start: date | None = None
+        self.daily: dict[str, array] = {}
+
+    @property
+    def hours(self) -> int:
+        return len(self.hourly.get("temperature_2m", ()))
 
-        cur = data.get("current", {})
-        daily = data.get("daily", {})
-        code = cur.get("weather_code", 0)
-        max_temps = daily.get("temperature_2m_max", [])
-        min_temps = daily.get("temperature_2m_min", [])
+    def load(self, data: dict, units: str = "imperial"):
+        hourly = data.get("hourly") or {}
+        daily = data.get("daily") or {}
+        times = hourly.get("time") or []
+        days = daily.get("time") or []
+        if not times:
+            return
+        self.hourly = {f: _to_array(hourly.get(f) or [None] * len(times)) for f in HOURLY_FIELDS}
+        self.hourly_start = datetime.fromisoformat(times[0])
+        self.daily = {f: _to_array(daily.get(f) or [None] * len(days)) for f in DAILY_FIELDS}
+        self.daily_start = date.fromisoformat(days[0]) if days else None
+        self.units = units
+        self.updated_at = datetime.now()
 
+    def _hour_index(self, when: datetime) -> int | None:
+        if self.hourly_start is None:
+            return None
+        i = int((when.replace(tzinfo=None) - self.hourly_start) // timedelta(hours=1))
+        return i if 0 <= i < self.hours else None
+
+    def _hour_row(self, i: int) -> dict:
+        h = self.hourly
+        code = _num(h["weather_code"], i)
         return {
-            "temp_f": round(cur.get("temperature_2m", 0)),
-            "desc": WMO_DESCRIPTIONS.get(code, f"Code {code}"),
-            "icon": WMO_ICONS.get(code, "\U0001f321\ufe0f"),
-            "humidity": cur.get("relative_humidity_2m", 0),
-            "feels_like": round(cur.get("apparent_temperature", 0)),
-            "wind_mph": round(cur.get("wind_speed_10m", 0)),
-            "high": round(max_temps[0]) if max_temps else None,
-            "low": round(min_temps[0]) if min_temps else None,
+            "time": (self.hourly_start + timedelta(hours=i)).isoformat(),
+            "temp": _num(h["temperature_2m"], i),
+            "feels_like": _num(h["apparent_temperature"], i),
+            "humidity": _num(h["relative_humidity_2m"], i),
+            "precip_prob": _num(h["precipitation_probability"], i),
+            "wind": _num(h["wind_speed_10m"], i),
+            "code": code,
+            "desc": _desc(code) if code is not None else None,
+            "icon": _icon(code) if code is not None else None,
         }
-    except Exception:
-        return None
+
+    def hourly_from(self, start: datetime, hours: int) -> list[dict]:
+        i = self._hour_index(start)
+        if i is None:
+            return []
+        return [self._hour_row(j) for j in range(i, min(i + hours, self.hours))]
+
+    def daily_from(self, start: date, days: int) -> list[dict]:
+        if self.daily_start is None:
+            return []
+        d = self.daily
+        n = len(d["temperature_2m_max"])
+        i = max((start - self.daily_start).days, 0)
+        rows = []
+        for j in range(i, min(i + days, n)):
+            code = _num(d["weather_code"], j)
+            rows.append({
+                "date": (self.daily_start + timedelta(days=j)).isoformat(),
+                "high": _num(d["temperature_2m_max"], j),
+                "low": _num(d["temperature_2m_min"], j),
+                "precip_prob": _num(d["precipitation_probability_max"], j),
+                "code": code,
+                "desc": _desc(code) if code is not None else None,
+                "icon": _icon(code) if code is not None else None,
+            })
+        return rows
+
+    def describe_at(self, when: datetime) -> str | None:
+        """Conditions label (e.g. "Partly cloudy") for a time inside the stored window."""
+        i = self._hour_index(when)
+        if i is None:
+            return None
+        code = _num(self.hourly["weather_code"], i)
+        return _desc(code) if code is not None else None
+
+
+class WeatherCache:
+    """TTL cache over a WeatherBackend with stale-while-revalidate and request coalescing.
+
+    - Fresh (< ttl): served from memory.
+    - Stale (< max_stale): served from memory while one background refresh runs.
+    - Missing/expired: callers await a single shared upstream fetch (or get None with wait=False).
+    Failed fetches are remembered for failure_ttl so an outage isn't retried on every request.
+    Listeners receive every successful raw response (the forecast store hangs off this).
+    """
+
+    def __init__(
+        self,
+        backend: WeatherBackend,
+        ttl: float = 900.0,
+        max_stale: float = 3 * 3600.0,
+        failure_ttl: float = 60.0,
+    ):
+        self.backend = backend
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.failure_ttl = failure_ttl
+        self.listeners: list[Callable[[WeatherKey, dict], None]] = []  # called with each fresh (key, raw)
+        self._entries: dict[WeatherKey, tuple[float, dict]] = {}
+        self._failures: dict[WeatherKey, float] = {}
+        self._inflight: dict[WeatherKey, asyncio.Task] = {}
+
+    @staticmethod
+    def key(lat: float, lon: float, units: str) -> WeatherKey:
+        return (round(lat, 4), round(lon, 4), units)
+
+    async def get(self, lat: float, lon: float, units: str = "imperial", wait: bool = True) -> dict | None:
+        key = self.key(lat, lon, units)
+        now = time.monotonic()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            fetched_at, value = entry
+            age = now - fetched_at
+            if age < self.ttl:
+                return value
+            if age < self.max_stale:
+                self._refresh(key)
+                return value
+
+        failed_at = self._failures.get(key)
+        if failed_at is not None and now - failed_at < self.failure_ttl:
+            return None
+
+        task = self._refresh(key)
+        if not wait:
+            return None
+        # Shield so a caller that gives up (e.g. a dashboard widget timeout)
+        # doesn't cancel the fetch other callers are waiting on.
+        return await asyncio.shield(task)
+
+    async def refresh(self, lat: float, lon: float, units: str = "imperial") -> dict | None:
+        """Force a (coalesced) upstream fetch regardless of freshness."""
+        return await asyncio.shield(self._refresh(self.key(lat, lon, units)))
+
+    def _refresh(self, key: WeatherKey) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return task
+
+    async def _fetch(self, key: WeatherKey) -> dict | None:
+        lat, lon, units = key
+        try:
+            raw = await self.backend.fetch(lat, lon, units)
+            value = _parse_current(raw, units)
+        except Exception as e:
+            logger.warning(f"Weather fetch failed: {e!r}")
+            self._failures[key] = time.monotonic()
+            entry = self._entries.get(key)
+            return entry[1] if entry else None
+        self._entries[key] = (time.monotonic(), value)
+        self._failures.pop(key, None)
+        for listener in self.listeners:
+            try:
+                listener(key, raw)
+            except Exception as e:
+                logger.warning(f"Weather listener failed: {e!r}")
+        return value
+
+    def clear(self):
+        self._entries.clear()
+        self._failures.clear()
+
+
+weather_cache = WeatherCache(OpenMeteoBackend())
+forecast_store = ForecastStore()
+
+
+def _store_home_forecast(key: WeatherKey, raw: dict):
+    # Lookups for other places (outdoor spots, chat) must not replace the home forecast
+    if key == WeatherCache.key(settings.weather_lat, settings.weather_lon, "imperial"):
+        forecast_store.load(raw, "imperial")
+
+
+weather_cache.listeners.append(_store_home_forecast)
+
+
+def set_weather_backend(backend: WeatherBackend):
+    """Swap the upstream (e.g. for a local stand-in); clears cached readings."""
+    weather_cache.backend = backend
+    weather_cache.clear()
+
+
+async def get_weather(
+    lat: float | None = None,
+    lon: float | None = None,
+    units: str = "imperial",
+    wait: bool = True,
+) -> dict | None:
+    """Current weather (defaults to Fort Collins, CO), served from the shared cache."""
+    return await weather_cache.get(
+        settings.weather_lat if lat is None else lat,
+        settings.weather_lon if lon is None else lon,
+        units,
+        wait=wait,
+    )
+
+
+async def run_forecast_prefetcher(interval_seconds: float):
+    """Background loop: refresh the home forecast every interval so user requests never wait on Open-Meteo."""
+    while True:
+        await weather_cache.refresh(settings.weather_lat, settings.weather_lon, "imperial")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,203 @@
+"""Benchmark the chat tool loop offline by replaying a recorded transcript.
+
+    python scripts/bench_chat.py scripts/transcripts/whats_due.json --runs 20
+    python scripts/bench_chat.py out.json --record --message "What's for dinner?"
+
+Replay runs ChatService against the configured database with a ReplayBackend
+in place of the Anthropic API, and reports per-iteration model latency, tool
+execution time, serialization time and DB query counts. --record calls the
+real API once and saves the responses as a transcript for later replay.
+
+Every run happens inside a transaction that is rolled back, so the saved
+conversation (and anything a recorded tool call changed) never persists.
+Replay only accepts transcripts whose tool calls are all read-only.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database import async_session, engine
+from backend.http_clients import http_clients
+from backend.models.user import User
+from backend.services.chat_service import READ_ONLY_TOOLS, ChatService
+from backend.services.llm_backend import AnthropicBackend, RecordingBackend, ReplayBackend
+
+
+class TurnMetrics:
+    def __init__(self):
+        self.iterations: list[dict] = []
+        self.queries = 0  # bumped by the engine's before_cursor_execute listener
+
+    def start_iteration(self):
+        self.iterations.append({"llm": 0.0, "tools": 0.0, "tool_calls": 0, "serialize": 0.0, "queries_at": self.queries})
+
+    def finish(self):
+        # An iteration's queries run from its model call up to the next one
+        ends = [it["queries_at"] for it in self.iterations[1:]] + [self.queries]
+        for it, end in zip(self.iterations, ends):
+            it["queries"] = end - it["queries_at"]
+
+    @property
+    def current(self) -> dict:
+        return self.iterations[-1]
+
+
+class InstrumentedChatService(ChatService):
+    """ChatService with timing around the model call, tool execution and serialization."""
+
+    metrics: TurnMetrics = TurnMetrics()
+
+    def _build_request(self, messages, summary):
+        start = time.perf_counter()
+        body = super()._build_request(messages, summary)
+        self.metrics.current["serialize"] += time.perf_counter() - start
+        return body
+
+    async def _stream_message(self, messages, summary=None):
+        self.metrics.start_iteration()
+        start = time.perf_counter()
+        async for ev in super()._stream_message(messages, summary):
+            if ev["type"] == "message":
+                self.metrics.current["llm"] += time.perf_counter() - start
+            yield ev
+
+    async def _run_tool_calls(self, calls):
+        start = time.perf_counter()
+        async for ev in super()._run_tool_calls(calls):
+            if ev["type"] == "results":
+                self.metrics.current["tools"] += time.perf_counter() - start
+                self.metrics.current["tool_calls"] += len(calls)
+            yield ev
+
+    def _serialize_result(self, result, tool_input):
+        start = time.perf_counter()
+        text = super()._serialize_result(result, tool_input)
+        self.metrics.current["serialize"] += time.perf_counter() - start
+        return text
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:8.2f}"
+
+
+@asynccontextmanager
+async def rolled_back_session():
+    """A session whose commits become savepoints inside one outer transaction that is rolled back."""
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        db = AsyncSession(bind=conn, expire_on_commit=False, join_transaction_mode="create_savepoint")
+        try:
+            yield db
+        finally:
+            await db.close()
+            await trans.rollback()
+
+
+def _check_read_only(transcript: dict, path: str):
+    writes = sorted({
+        block["name"]
+        for response in transcript["responses"]
+        for block in response["content"]
+        if block["type"] == "tool_use" and block["name"] not in READ_ONLY_TOOLS
+    })
+    if writes:
+        raise SystemExit(f"{path} calls tools that change data ({', '.join(writes)}); refusing to replay it")
+
+
+async def _user(db, username: str | None) -> User:
+    query = select(User).order_by(User.id)
+    if username:
+        query = select(User).where(User.username == username)
+    user = (await db.execute(query)).scalars().first()
+    if user is None:
+        raise SystemExit("No user found; run scripts/seed_users.py first")
+    return user
+
+
+async def record(path: str, message: str, username: str | None):
+    backend = RecordingBackend(AnthropicBackend())
+    async with rolled_back_session() as db:
+        result = await ChatService(db, await _user(db, username), backend).chat(message)
+    backend.save(path, message)
+    print(f"Recorded {len(backend.responses)} responses to {path}")
+    print(result["response"])
+
+
+async def replay(path: str, runs: int, latency: float, username: str | None):
+    transcript = json.loads(Path(path).read_text())
+    _check_read_only(transcript, path)
+    backend = ReplayBackend(transcript["responses"], latency=latency)
+
+    def count_query(*args):
+        InstrumentedChatService.metrics.queries += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_query)
+
+    turns: list[tuple[float, TurnMetrics]] = []
+    async with async_session() as db:
+        user = await _user(db, username)
+    for _ in range(runs):
+        backend.reset()
+        InstrumentedChatService.metrics = TurnMetrics()
+        async with rolled_back_session() as db:
+            start = time.perf_counter()
+            await InstrumentedChatService(db, user, backend).chat(transcript["message"])
+            elapsed = time.perf_counter() - start
+        InstrumentedChatService.metrics.finish()
+        turns.append((elapsed, InstrumentedChatService.metrics))
+
+    print(f"{path}: {runs} runs, {len(transcript['responses'])} model calls per turn, "
+          f"simulated model latency {latency * 1000:.0f} ms\n")
+    print(" iter   llm ms  tools ms  calls  serialize ms  queries")
+    for i in range(len(turns[0][1].iterations)):
+        rows = [m.iterations[i] for _, m in turns if i < len(m.iterations)]
+        print(
+            f"{i + 1:5d} {_ms(statistics.mean(r['llm'] for r in rows))}"
+            f"  {_ms(statistics.mean(r['tools'] for r in rows))}"
+            f"  {rows[0]['tool_calls']:5d}"
+            f"      {_ms(statistics.mean(r['serialize'] for r in rows))}"
+            f"  {statistics.mean(r['queries'] for r in rows):7.1f}"
+        )
+
+    totals = sorted(t for t, _ in turns)
+    p95 = totals[min(len(totals) - 1, int(len(totals) * 0.95))]
+    queries = statistics.mean(m.queries for _, m in turns)
+    print(f"\nturn ms: mean {_ms(statistics.mean(totals))}  p50 {_ms(statistics.median(totals))}  p95 {_ms(p95)}")
+    print(f"DB queries per turn: {queries:.1f}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("transcript", help="Transcript JSON to replay (or write, with --record)")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated model latency per call")
+    parser.add_argument("--user", help="Username to run as (default: first user)")
+    parser.add_argument("--record", action="store_true", help="Call the real API and save a transcript")
+    parser.add_argument("--message", help="Message to send when recording")
+    args = parser.parse_args()
+
+    try:
+        if args.record:
+            if not args.message:
+                parser.error("--record needs --message")
+            await record(args.transcript, args.message, args.user)
+        else:
+            await replay(args.transcript, args.runs, args.latency_ms / 1000, args.user)
+    finally:
+        await http_clients.aclose()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,31 @@
+import contextlib
+
+import pytest
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+
+from backend.database import Base
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_as_json(type_, compiler, **kw):
+    return "JSON"
+
+
+@pytest.fixture
+def sqlite_session():
+    """Opens an AsyncSession on a fresh in-memory SQLite database holding the given models' tables."""
+
+    @contextlib.asynccontextmanager
+    async def open_session(*models):
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[model.__table__ for model in models])
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+                yield session
+        finally:
+            await engine.dispose()
+
+    return open_session
@@ -0,0 +1,32 @@
+from datetime import datetime, timedelta, timezone
+
+from backend.services.calendar_service import EXPANSION_BLOCK_DAYS, ExpansionCache, _expansion_window
+
+WEEKLY = (
+    "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//test//EN\r\nBEGIN:VEVENT\r\nUID:standup@example.com\r\n"
+    "SUMMARY:Standup\r\nDTSTART:20260105T150000Z\r\nDTEND:20260105T153000Z\r\nRRULE:FREQ=WEEKLY\r\n"
+    "END:VEVENT\r\nEND:VCALENDAR\r\n"
+)
+
+
+def test_expansion_window_is_block_aligned_and_covers_the_query():
+    start = datetime(2026, 3, 10, 9, 41, tzinfo=timezone.utc)
+    end = start + timedelta(days=7)
+    first, last = _expansion_window(start, end)
+    assert first <= start and end <= last
+    assert first.toordinal() % EXPANSION_BLOCK_DAYS == 0 and last.toordinal() % EXPANSION_BLOCK_DAYS == 0
+    assert _expansion_window(start + timedelta(minutes=5), end + timedelta(minutes=5)) == (first, last)
+
+
+def test_now_based_queries_share_one_expansion():
+    cache = ExpansionCache()
+    start = datetime(2026, 3, 10, 9, 41, tzinfo=timezone.utc)
+    first = cache.expand("standup@example.com", "FREQ=WEEKLY", '"1"', WEEKLY, start, start + timedelta(days=7))
+    again = cache.expand("standup@example.com", "FREQ=WEEKLY", '"1"', WEEKLY,
+                         start + timedelta(minutes=5), start + timedelta(days=7, minutes=5))
+    assert again is first and len(cache._entries) == 1
+    starts = [fields[2] for fields in first]
+    assert any(start <= s < start + timedelta(days=7) for s in starts)
+
+    cache.expand("standup@example.com", "FREQ=WEEKLY", '"2"', WEEKLY, start, start + timedelta(days=7))
+    assert len(cache._entries) == 2  # a new etag is a new entry
@@ -0,0 +1,122 @@
+import asyncio
+from datetime import datetime, timezone
+
+from caldav.elements import dav
+from sqlalchemy import select
+
+from backend.models.calendar import CachedCalendarEvent, CalendarSource, CalendarSyncState
+from backend.services.calendar_sync import CalendarSyncService, _collect, _pull_calendar
+
+CALENDAR = "https://dav.example.com/cal/home/"
+
+
+def ical(uid: str, summary: str = "Dentist") -> str:
+    return (
+        "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//test//EN\r\nBEGIN:VEVENT\r\n"
+        f"UID:{uid}\r\nSUMMARY:{summary}\r\nDTSTART:20260105T150000Z\r\nDTEND:20260105T160000Z\r\n"
+        "END:VEVENT\r\nEND:VCALENDAR\r\n"
+    )
+
+
+class Resource:
+    def __init__(self, href: str, data: str | None, etag: str | None = None):
+        self.url = href
+        self.data = data
+        self.props = {dav.GetEtag.tag: etag} if etag else {}
+
+
+class Objects(list):
+    def __init__(self, resources, sync_token):
+        super().__init__(resources)
+        self.sync_token = sync_token
+
+
+class Calendar:
+    """Answers sync-collection like a caldav Calendar, recording the tokens it was asked for."""
+
+    def __init__(self, objects: dict[str | None, Objects] | None = None, events=(), ctag=None):
+        self.url = CALENDAR
+        self.objects = objects or {}
+        self.ctag = ctag
+        self._events = list(events)
+        self.requested = []
+
+    def get_property(self, prop):
+        return self.ctag
+
+    def objects_by_sync_token(self, sync_token=None, load_objects=False, disable_fallback=False):
+        assert disable_fallback
+        self.requested.append(sync_token)
+        if sync_token not in self.objects:
+            raise Exception("sync-collection REPORT failed")
+        return self.objects[sync_token]
+
+    def events(self):
+        return self._events
+
+
+def test_collect_splits_upserts_and_deletes():
+    upserts, deletes = _collect([
+        Resource(f"{CALENDAR}a.ics", ical("a@example.com"), etag='"1"'),
+        Resource(f"{CALENDAR}gone.ics", None),
+        Resource(f"{CALENDAR}broken.ics", "not ical"),
+    ])
+    assert deletes == [f"{CALENDAR}gone.ics"]
+    [row] = upserts
+    assert (row["href"], row["etag"], row["uid"]) == (f"{CALENDAR}a.ics", '"1"', "a@example.com")
+    assert row["summary"] == "Dentist"
+    assert row["starts_at"] == datetime(2026, 1, 5, 15, tzinfo=timezone.utc)
+
+
+def test_pull_with_server_token_is_incremental():
+    cal = Calendar({"tok-1": Objects([Resource(f"{CALENDAR}gone.ics", None)], "tok-2")})
+    pull = _pull_calendar(cal, None, "tok-1")
+    assert (pull.full, pull.sync_token, pull.deletes) == (False, "tok-2", [f"{CALENDAR}gone.ics"])
+
+
+def test_expired_token_retries_as_full_listing():
+    cal = Calendar({None: Objects([Resource(f"{CALENDAR}a.ics", ical("a"))], "tok-9")})
+    pull = _pull_calendar(cal, None, "expired")
+    assert cal.requested == ["expired", None]
+    assert (pull.full, pull.sync_token, len(pull.upserts)) == (True, "tok-9", 1)
+
+
+def test_fake_token_is_never_sent_or_stored():
+    cal = Calendar({None: Objects([Resource(f"{CALENDAR}a.ics", ical("a"))], "fake-abc")})
+    pull = _pull_calendar(cal, None, "fake-old")
+    assert cal.requested == [None]
+    assert pull.full and pull.sync_token is None
+
+
+def test_no_sync_collection_falls_back_to_full_listing():
+    cal = Calendar(events=[Resource(f"{CALENDAR}a.ics", ical("a"))])
+    pull = _pull_calendar(cal, None, None)
+    assert (pull.full, pull.sync_token, len(pull.upserts)) == (True, None, 1)
+
+
+def test_unchanged_ctag_skips_the_report():
+    cal = Calendar(ctag="c1")
+    pull = _pull_calendar(cal, "c1", "tok-1")
+    assert cal.requested == [] and not pull.changed and pull.sync_token == "tok-1"
+
+
+def test_prune_drops_calendars_no_longer_listed(sqlite_session):
+    async def scenario():
+        async with sqlite_session(CalendarSource, CalendarSyncState, CachedCalendarEvent) as db:
+            db.add(CalendarSource(id=1, user_id=1, provider="proton", caldav_url="https://dav.example.com"))
+            for calendar_url in (CALENDAR, "https://dav.example.com/cal/old/"):
+                db.add(CalendarSyncState(source_id=1, calendar_url=calendar_url, sync_token="t"))
+                db.add(CachedCalendarEvent(
+                    source_id=1, calendar_url=calendar_url, href=f"{calendar_url}a.ics", uid="a", summary="x",
+                    starts_at=datetime(2026, 1, 5, tzinfo=timezone.utc), ical=ical("a"),
+                ))
+            await db.commit()
+
+            service = CalendarSyncService(db)
+            assert await service._prune(1, [CALENDAR])
+            assert not await service._prune(1, [CALENDAR])
+            events = (await db.execute(select(CachedCalendarEvent.calendar_url))).scalars().all()
+            states = (await db.execute(select(CalendarSyncState.calendar_url))).scalars().all()
+            assert events == [CALENDAR] and states == [CALENDAR]
+
+    asyncio.run(scenario())
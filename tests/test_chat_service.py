@@ -0,0 +1,161 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import func, select
+
+from backend.models.chat import ChatConversation, ChatMessage
+from backend.services import conversation_service
+from backend.services.conversation_service import _window_start, estimate_tokens
+from backend.services.chat_service import ChatService
+
+
+class ScriptedBackend:
+    """Streams one canned text reply per model call; an exception entry fails that call."""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+
+    async def stream(self, body: bytes):
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        yield {"type": "message_start", "message": {"usage": {"input_tokens": 10}}}
+        yield {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}}
+        yield {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": reply}}
+        yield {"type": "content_block_stop", "index": 0}
+        yield {"type": "message_delta", "delta": {"stop_reason": "end_turn"}, "usage": {"output_tokens": 3}}
+
+
+USER = SimpleNamespace(id=1)
+
+
+async def count(db, model) -> int:
+    return (await db.execute(select(func.count()).select_from(model))).scalar_one()
+
+
+def test_failed_first_turn_stores_no_conversation(sqlite_session):
+    async def scenario():
+        async with sqlite_session(ChatConversation, ChatMessage) as db:
+            service = ChatService(db, USER, ScriptedBackend(RuntimeError("overloaded")))
+            with pytest.raises(RuntimeError):
+                await service.chat("What's for dinner?")
+            await db.rollback()
+            assert await count(db, ChatConversation) == 0
+
+    asyncio.run(scenario())
+
+
+def test_reply_does_not_wait_for_compaction(sqlite_session, monkeypatch):
+    async def scenario():
+        release = asyncio.Event()
+        compacted = []
+
+        async def slow_compact(conversation_id: int):
+            await release.wait()
+            compacted.append(conversation_id)
+
+        monkeypatch.setattr(conversation_service, "_compact", slow_compact)
+        async with sqlite_session(ChatConversation, ChatMessage) as db:
+            result = await ChatService(db, USER, ScriptedBackend("Tacos.")).chat("What's for dinner?")
+            conversation_id = result["conversation_id"]
+            assert result["response"] == "Tacos."
+            assert await count(db, ChatConversation) == 1
+            assert await count(db, ChatMessage) == 2
+            assert compacted == [] and conversation_id in conversation_service._compactions
+
+            release.set()
+            await conversation_service._compactions[conversation_id]
+            assert compacted == [conversation_id]
+
+    asyncio.run(scenario())
+
+
+def call(id: str, name: str, **inp) -> dict:
+    return {"type": "tool_use", "id": id, "name": name, "input": inp}
+
+
+class FakeToolService(ChatService):
+    """Runs tools without a database; reads finish in reverse order of their delay."""
+
+    def __init__(self):
+        super().__init__(None, USER, ScriptedBackend())
+        self.executed = []
+
+    async def _execute_tool(self, tool_name: str, tool_input: dict) -> str:
+        self.executed.append(tool_name)
+        self.actions_taken.append({"tool": tool_name})
+        return f'{{"result":"{tool_name}"}}'
+
+    async def _execute_isolated(self, tool_name: str, tool_input: dict) -> tuple[str, list[dict]]:
+        await asyncio.sleep(tool_input.get("delay", 0))
+        self.executed.append(tool_name)
+        return f'{{"result":"{tool_name}"}}', [{"tool": tool_name}]
+
+
+def test_tool_batches_group_consecutive_reads():
+    calls = [
+        call("1", "list_chores"), call("2", "get_meals"),
+        call("3", "complete_chore"),
+        call("4", "list_pantry"),
+        call("5", "create_meal"), call("6", "create_chore"),
+        call("7", "get_grocery_lists"), call("8", "search_recipes"),
+    ]
+    batches = FakeToolService()._tool_batches(calls)
+    assert [[c["id"] for c in batch] for batch in batches] == [["1", "2"], ["3"], ["4"], ["5"], ["6"], ["7", "8"]]
+
+
+def test_tool_results_and_actions_keep_call_order():
+    async def scenario():
+        service = FakeToolService()
+        calls = [call("1", "list_chores", delay=0.02), call("2", "get_meals"), call("3", "complete_chore")]
+        events = [event async for event in service._run_tool_calls(calls)]
+
+        done = [e["id"] for e in events if e["type"] == "tool_done"]
+        assert done == ["2", "1", "3"]  # reads ran concurrently
+        assert [r["tool_use_id"] for r in events[-1]["results"]] == ["1", "2", "3"]
+        assert [a["tool"] for a in service.actions_taken] == ["list_chores", "get_meals", "complete_chore"]
+
+    asyncio.run(scenario())
+
+
+def test_reads_are_memoized_until_a_write_to_their_domain():
+    async def scenario():
+        service = FakeToolService()
+        calls = [
+            call("1", "list_chores"), call("2", "get_meals"),
+            call("3", "create_meal"),
+            call("4", "list_chores"), call("5", "get_meals"),
+        ]
+        events = [event async for event in service._run_tool_calls(calls)]
+        assert service.executed.count("list_chores") == 1
+        assert service.executed.count("get_meals") == 2
+        assert len(events[-1]["results"]) == 5
+
+    asyncio.run(scenario())
+
+
+def stored(*messages: tuple[str, str | list, int]) -> list[ChatMessage]:
+    return [ChatMessage(id=i + 1, role=role, content=content, token_estimate=tokens)
+            for i, (role, content, tokens) in enumerate(messages)]
+
+
+def test_window_keeps_newest_whole_exchanges_within_budget():
+    messages = stored(
+        ("user", "first", 100),
+        ("assistant", [{"type": "text", "text": "a"}], 100),
+        ("user", "second", 100),
+        ("assistant", [{"type": "tool_use", "id": "t", "name": "list_chores", "input": {}}], 100),
+        ("user", [{"type": "tool_result", "tool_use_id": "t", "content": "[]"}], 100),
+        ("assistant", [{"type": "text", "text": "b"}], 100),
+    )
+    assert _window_start(messages, 1000) == 0
+    assert _window_start(messages, 450) == 2
+    # A window never starts at a tool_result, which would orphan it from its tool_use
+    assert _window_start(messages, 350) == 6
+    assert _window_start(messages, 50) == 6
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("x" * 400) == 104
+    assert estimate_tokens([{"type": "text", "text": "hi"}]) == len('[{"type":"text","text":"hi"}]') // 4 + 4
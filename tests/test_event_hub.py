@@ -0,0 +1,42 @@
+import asyncio
+import json
+
+from backend.services.event_hub import EventHub
+
+
+def payloads(sub) -> list[dict]:
+    frames = []
+    while not sub.queue.empty():
+        frames.append(sub.queue.get_nowait())
+    return [json.loads(frame.split("data: ", 1)[1]) for frame in frames]
+
+
+def test_topics_match_exactly_or_by_prefix():
+    async def scenario():
+        hub = EventHub()
+        all_grocery = hub.subscribe({"grocery"})
+        one_list = hub.subscribe({"grocery:12"})
+        dashboard = hub.subscribe({"dashboard"})
+        hub.publish("grocery:12", "item_added", {"id": 1})
+        hub.publish("grocery:13", "item_added", {"id": 2})
+        assert [p["data"]["id"] for p in payloads(all_grocery)] == [1, 2]
+        assert [p["data"]["id"] for p in payloads(one_list)] == [1]
+        assert payloads(dashboard) == []
+
+    asyncio.run(scenario())
+
+
+def test_slow_subscriber_gets_one_resync_instead_of_a_backlog():
+    async def scenario():
+        hub = EventHub(max_queue=3)
+        slow = hub.subscribe({"grocery"})
+        for i in range(5):
+            hub.publish("grocery:1", "item_added", {"id": i})
+        assert [(p["type"], p["data"]) for p in payloads(slow)] == [("resync", {}), ("item_added", {"id": 4})]
+        assert slow.dropped == 3
+
+        hub.unsubscribe(slow)
+        hub.publish("grocery:1", "item_added", {"id": 5})
+        assert hub.subscriber_count == 0 and payloads(slow) == []
+
+    asyncio.run(scenario())
@@ -0,0 +1,111 @@
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from backend.models.grocery import GroceryItem, GroceryList
+from backend.models.pantry import PantryItem
+from backend.services.grocery_service import GroceryService, ingredient_key
+from backend.services.quantities import QuantityTotal
+
+WEEK_OF = date.today()
+
+
+def totals(**lines: str | None) -> dict[str, tuple[dict, QuantityTotal]]:
+    result = {}
+    for name, quantity in lines.items():
+        name = name.replace("_", " ")
+        total = QuantityTotal()
+        total.add(quantity)
+        result[ingredient_key(name)] = ({"name": name, "quantity": quantity}, total)
+    return result
+
+
+def test_subtract_pantry(sqlite_session):
+    async def scenario():
+        async with sqlite_session(PantryItem) as db:
+            db.add_all([
+                PantryItem(item_name="Rice", quantity="4", unit="cups"),
+                PantryItem(item_name="Milk", quantity="1", unit="cup"),
+                PantryItem(item_name="Salt"),
+                PantryItem(item_name="Spinach", quantity="1", unit="lb", expiration_date=WEEK_OF + timedelta(days=3)),
+                PantryItem(item_name="Eggs", quantity="12", expiration_date=WEEK_OF - timedelta(days=1)),
+                PantryItem(item_name="Garlic", unit="head"),
+            ])
+            await db.commit()
+
+            week = totals(rice="2 cups", milk="3 cups", salt=None, spinach="8 oz", eggs="6", garlic="3 cloves")
+            notes = await GroceryService(db)._subtract_pantry(week, WEEK_OF)
+
+            assert "rice" not in week  # covered by stock that keeps
+            assert str(week["milk"][1]) == "2 cups" and notes["milk"] == "1 cup on hand"
+            # An unmeasured line isn't covered by unmeasured stock; it stays with a reminder
+            assert "salt" in week and notes["salt"] == "some in pantry"
+            assert str(week["spinach"][1]) == "" and notes["spinach"].startswith("using 1 lb from pantry, expires")
+            assert str(week["egg"][1]) == "6" and notes["egg"].startswith("pantry stock expired")
+            assert str(week["garlic"][1]) == "3 cloves" and notes["garlic"] == "head in pantry"
+
+    asyncio.run(scenario())
+
+
+def test_reconcile_only_touches_items_as_generated(sqlite_session):
+    async def scenario():
+        async with sqlite_session(GroceryList, GroceryItem) as db:
+            before = {
+                "carrot": {"quantity": "2", "notes": None},
+                "milk": {"quantity": "2 cups", "notes": None},
+                "egg": {"quantity": "6", "notes": None},
+                "onion": {"quantity": "1", "notes": None},
+                "garlic": {"quantity": "2 cloves", "notes": None},
+                "basil": {"quantity": "1 bunch", "notes": None},
+            }
+            grocery_list = GroceryList(week_of=WEEK_OF, meal_snapshot={"meals": [], "items": before})
+            db.add(grocery_list)
+            await db.flush()
+            db.add_all([
+                GroceryItem(list_id=grocery_list.id, item_name="Carrots", quantity="2"),
+                GroceryItem(list_id=grocery_list.id, item_name="carrot", quantity="2"),  # duplicate from an older list
+                GroceryItem(list_id=grocery_list.id, item_name="Milk", quantity="1 gal"),  # edited by hand
+                GroceryItem(list_id=grocery_list.id, item_name="Eggs", quantity="6", is_purchased=True),
+                GroceryItem(list_id=grocery_list.id, item_name="Basil", quantity="1 bunch"),
+                GroceryItem(list_id=grocery_list.id, item_name="Paper towels", is_manual=True),
+            ])  # onion and garlic were deleted by hand
+            await db.commit()
+
+            service = GroceryService(db)
+            grocery_list = await service.get(grocery_list.id, with_items=True)
+            week = totals(carrots="3", milk="3 cups", eggs="12", onion="1", garlic="4 cloves", rice="2 cups")
+            generated = {key: {"quantity": str(total), "notes": None} for key, (_, total) in week.items()}
+            snapshot = {"meals": [], "items": generated}
+            grocery_list = await service._reconcile(grocery_list, week, generated, snapshot)
+
+            assert sorted((item.item_name, item.quantity) for item in grocery_list.items) == [
+                ("Carrots", "3"),
+                ("Eggs", "6"),
+                ("Milk", "1 gal"),
+                ("Paper towels", None),
+                ("garlic", "4 cloves"),
+                ("rice", "2 cups"),
+            ]
+            assert grocery_list.meal_snapshot == snapshot
+
+    asyncio.run(scenario())
+
+
+def test_regenerating_by_list_id_checks_the_list(sqlite_session):
+    async def scenario():
+        async with sqlite_session(GroceryList, GroceryItem) as db:
+            generated = GroceryList(week_of=WEEK_OF - timedelta(days=7), meal_snapshot={"meals": [], "items": {}})
+            by_hand = GroceryList(week_of=WEEK_OF)
+            db.add_all([generated, by_hand])
+            await db.commit()
+
+            service = GroceryService(db)
+            for grocery_list, detail in ((generated, "is for the week of"), (by_hand, "not generated from meals")):
+                with pytest.raises(HTTPException) as raised:
+                    await service._generated_list(WEEK_OF, grocery_list.id)
+                assert raised.value.status_code == 400 and detail in raised.value.detail
+            assert (await service._generated_list(WEEK_OF - timedelta(days=7), None)).id == generated.id
+
+    asyncio.run(scenario())
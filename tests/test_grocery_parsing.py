@@ -0,0 +1,36 @@
+import pytest
+
+from backend.services.grocery_service import JsonObjectStream, _categorize_item, _pasted_item_names
+
+
+@pytest.mark.parametrize("name, category", [
+    ("Jalapeños", "Produce"),
+    ("Cherry Tomatoes", "Produce"),
+    ("Blueberries", "Produce"),
+    ("pineapple", "Produce"),
+    ("Chicken Breast", "Meat & Seafood"),
+    ("Ground Beef", "Meat & Seafood"),
+    ("Greek yogurt", "Dairy & Eggs"),
+    ("Eggs", "Dairy & Eggs"),
+    ("corn tortillas", "Bakery & Bread"),
+    ("frozen peas", "Frozen"),
+    ("peanut butter", "Pantry"),
+    ("soy sauce", "Pantry"),
+    ("paper towels", "Pantry"),
+])
+def test_categorize_item(name, category):
+    assert _categorize_item(name) == category
+
+
+def test_json_object_stream_yields_objects_as_they_close():
+    stream = JsonObjectStream()
+    assert stream.feed('```json\n[{"name": "rice", "quantity": "2 cups"}, {"name": "a \\"b\\" {c') == [
+        {"name": "rice", "quantity": "2 cups"},
+    ]
+    assert stream.feed('}"}]\n```') == [{"name": 'a "b" {c}'}]
+    assert stream.feed("") == []
+
+
+def test_pasted_item_names_strip_list_markers():
+    text = "- [ ] eggs\n\n* milk\n1. bread\n2) butter\n[x] jam\n  • tea  \n- "
+    assert _pasted_item_names(text) == ["eggs", "milk", "bread", "butter", "jam", "tea"]
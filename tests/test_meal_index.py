@@ -0,0 +1,61 @@
+import pytest
+
+from backend.services.grocery_service import BUILTIN_MEALS, MEAL_INGREDIENTS, MealIndex, _match_meal
+
+
+def names(ingredients: list[dict] | None) -> list[str] | None:
+    return [i["name"] for i in ingredients] if ingredients else None
+
+
+@pytest.mark.parametrize("meal", [
+    "Chicken Alfredo",
+    "Chicken Curry",
+    "Chicken Parmesan",
+    "Chicken Enchiladas",
+    "Chicken Fajitas",
+    "Chicken Pot Pie",
+    "Chicken Wings",
+    "Chicken Salad",
+    "Chicken Fried Rice",
+    "Beef Stir-Fry",
+    "Chicken Tacos",
+])
+def test_near_misses_are_left_for_ollama(meal):
+    assert BUILTIN_MEALS.search(meal) == (0.0, None)
+    assert _match_meal(meal) is None
+
+
+@pytest.mark.parametrize("meal, expected", [
+    ("Tacos", "tacos"),
+    ("fish tacos", "tacos"),
+    ("Grilled Chicken Breast", "grilled chicken"),
+    ("Chicken Stir-Fry", "stir fry"),
+    ("Homemade Mac & Cheese", "mac and cheese"),
+    ("Pepperoni Pizza", "pizza"),
+    ("chiken soup", "chicken soup"),
+    ("spagheti bolognese", "spaghetti"),
+])
+def test_matches(meal, expected):
+    score, ingredients = BUILTIN_MEALS.search(meal)
+    assert score >= 0.5
+    assert names(ingredients) == names(MEAL_INGREDIENTS[expected])
+
+
+def test_exact_match_scores_one():
+    assert BUILTIN_MEALS.search("  SALMON ") == (1.0, MEAL_INGREDIENTS["salmon"])
+
+
+def test_shared_common_word_is_not_enough():
+    index = MealIndex()
+    index.add("Chicken Soup", [{"name": "chicken broth"}])
+    index.add("Chicken Tikka Masala", [{"name": "garam masala"}])
+    assert index.search("Chicken Noodle Casserole") == (0.0, None)
+    assert names(index.search("Chicken Tikka")[1]) is None
+    assert names(index.search("Easy Chicken Tikka Masala")[1]) == ["garam masala"]
+
+
+def test_saved_recipe_preferred_over_builtin():
+    recipes = MealIndex()
+    recipes.add("Fish Tacos", [{"name": "cod"}, {"name": "cabbage"}])
+    assert names(_match_meal("fish tacos", recipes)) == ["cod", "cabbage"]
+    assert names(_match_meal("beef tacos", recipes)) == names(MEAL_INGREDIENTS["tacos"])
@@ -0,0 +1,84 @@
+import pytest
+
+from backend.services.quantities import EACH, Quantity, QuantityTotal, format_quantity, parse_quantity
+
+
+@pytest.mark.parametrize("quantity, unit, expected", [
+    ("1 1/2", "cups", Quantity(1.5, "cup")),
+    ("½ cup", None, Quantity(0.5, "cup")),
+    ("1.5", "tbsp", Quantity(1.5, "tbsp")),
+    ("1 Tbsp.", None, Quantity(1.0, "tbsp")),
+    ("2-3 lbs", None, Quantity(3.0, "lb")),
+    ("2 to 3", "tablespoons", Quantity(3.0, "tbsp")),
+    ("3 cloves", None, Quantity(3.0, "clove")),
+    ("2", None, Quantity(2.0, EACH)),
+])
+def test_parse_quantity(quantity, unit, expected):
+    assert parse_quantity(quantity, unit) == expected
+
+
+@pytest.mark.parametrize("quantity", [None, "", "to taste", "a pinch", "2 large ripe avocados"])
+def test_parse_quantity_without_amount(quantity):
+    assert parse_quantity(quantity) is None
+
+
+@pytest.mark.parametrize("quantity, expected", [
+    (Quantity(1.5, "cup"), "1 1/2 cups"),
+    (Quantity(1.0, "cup"), "1 cup"),
+    (Quantity(0.333, "tsp"), "1/3 tsp"),
+    (Quantity(2.0, "clove"), "2 cloves"),
+    (Quantity(3.0, EACH), "3"),
+    (Quantity(1.23, "lb"), "1.23 lb"),
+])
+def test_format_quantity(quantity, expected):
+    assert format_quantity(quantity) == expected
+
+
+def total(*quantities: str | None) -> QuantityTotal:
+    result = QuantityTotal()
+    for quantity in quantities:
+        result.add(quantity)
+    return result
+
+
+def test_same_kind_sums_in_largest_unit_seen():
+    assert str(total("1 cup", "8 tbsp")) == "1 1/2 cups"
+    assert str(total("1 lb", "500 g")) == "2.1 lb"
+    assert str(total("1 can", "2 cans")) == "3 cans"
+
+
+def test_incompatible_kinds_and_notes_kept_side_by_side():
+    assert str(total("1 cup", "2 cloves", "pinch", "pinch")) == "1 cup + 2 cloves + pinch"
+
+
+def test_servings_scale():
+    scaled = QuantityTotal()
+    scaled.add("2 cups", scale=0.5)
+    assert str(scaled) == "1 cup"
+
+
+def test_subtracting_all_stock_covers_the_total():
+    t = total("2 cups", "1 cup")
+    assert t.subtract("1 qt")
+    assert t.covered
+
+
+def test_partial_stock_leaves_the_rest():
+    t = total("2 lbs")
+    assert t.subtract("8 oz")
+    assert not t.covered and str(t) == "1 1/2 lb"
+
+
+def test_incomparable_stock_is_not_subtracted():
+    t = total("2 cups")
+    assert not t.subtract("1 lb")
+    assert not t.subtract(None)
+    assert not t.covered and str(t) == "2 cups"
+
+
+def test_total_without_amounts_is_never_covered():
+    assert not total().covered
+    assert not total(None).covered
+    unmeasured = total("to taste")
+    assert not unmeasured.subtract("1 jar")
+    assert not unmeasured.covered
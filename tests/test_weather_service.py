@@ -0,0 +1,14 @@
+from backend.services.weather_service import _parse_current
+
+CURRENT = {"current": {"temperature_2m": 20.4, "wind_speed_10m": 16.1, "weather_code": 0}}
+
+
+def test_metric_readings_are_labelled_and_converted_for_legacy_keys():
+    current = _parse_current(CURRENT, "metric")
+    assert (current["temp"], current["wind_speed"], current["units"]) == (20, 16, "metric")
+    assert (current["temp_f"], current["wind_mph"]) == (69, 10)
+
+
+def test_imperial_readings_fill_both_keys():
+    current = _parse_current(CURRENT, "imperial")
+    assert (current["temp"], current["temp_f"], current["wind_speed"], current["wind_mph"]) == (20, 20, 16, 16)